@@ -0,0 +1,51 @@
+"""
+Throughput benchmark for jobs.utils2.clean_description.
+
+Compares the current implementation against the original multi-pass version
+on a corpus built from api.json and job.html.
+
+    python benchmarks/bench_clean_description.py [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR / "scraper_api_service"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "scraper_api_service.settings")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from jobs.tests import load_description_corpus, reference_clean_description  # noqa: E402
+from jobs.utils2 import clean_description  # noqa: E402
+
+
+def run(func, corpus, repeat):
+    timer = timeit.Timer(lambda: [func(text) for text in corpus])
+    return min(timer.repeat(repeat=repeat, number=1))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = load_description_corpus()
+    total_mb = sum(len(text) for text in corpus) / 1_000_000
+
+    old = run(reference_clean_description, corpus, args.repeat)
+    new = run(clean_description, corpus, args.repeat)
+
+    print(f"corpus: {len(corpus)} texts, {total_mb:.2f} M chars")
+    print(f"reference: {old * 1000:8.2f} ms  ({total_mb / old:7.1f} M chars/s)")
+    print(f"current:   {new * 1000:8.2f} ms  ({total_mb / new:7.1f} M chars/s)")
+    print(f"speedup:   {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Logging throughput benchmark for the scraper hot loop.
+
+Worker threads emit the log calls one scraped job makes, with no other work,
+so the numbers are pure logging overhead:
+
+* ``sync``: the old setup, four eager f-string INFO lines per job written
+  through a StreamHandler in the calling thread.
+* ``queue-verbose``: the same lines through jobs.log.QueueListenerHandler.
+* ``queue``: the current scraper calls: counters for the run summary plus
+  sampled DEBUG lines (off at INFO), and one summary line per run.
+
+    python benchmarks/bench_logging.py [--jobs 20000] [--workers 16] [--output FILE]
+"""
+import argparse
+import copy
+import logging
+import logging.config
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR / "scraper_api_service"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "scraper_api_service.settings")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from jobs.log import count, run_summary, sampled_debug  # noqa: E402
+
+logger = logging.getLogger("jobs.utils2")
+TITLE = "Senior Backend Engineer (Python, Django, PostgreSQL) - Fully Remote"
+
+
+def old_job(job_id):
+    logger.info(f"🔎 Processing job {job_id}...")
+    logger.info(f"✅ Job {job_id}: Company logo extracted from JSON")
+    logger.info(f"✅ Saved job {job_id}: {TITLE[:50]}")
+    logger.info(f"✅ Job {job_id} processed successfully")
+
+
+def new_job(job_id):
+    sampled_debug(logger, "🔎 Processing job %s...", job_id, job_id=job_id)
+    count("saved")
+    sampled_debug(logger, "✅ Saved job %s: %.50s", job_id, TITLE, job_id=job_id)
+    count("processed")
+
+
+def configure(mode, output):
+    config = copy.deepcopy(settings.LOGGING)
+    config["handlers"]["console"] = {
+        "class": "logging.FileHandler", "filename": output, "formatter": "simple", "mode": "w",
+    }
+    config["root"] = {"handlers": ["console" if mode == "sync" else "queue"], "level": "INFO"}
+    logging.config.dictConfig(config)
+
+
+def run(mode, jobs, workers, output):
+    configure(mode, output)
+    job = old_job if mode in ("sync", "queue-verbose") else new_job
+    started = time.perf_counter()
+    with run_summary(mode, logger), ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_start in range(0, jobs, 1000):
+            list(executor.map(job, range(chunk_start, min(chunk_start + 1000, jobs))))
+    emitted = time.perf_counter() - started
+    # Closing the handlers drains the queue, so this includes every write.
+    logging.config.dictConfig({"version": 1, "disable_existing_loggers": False})
+    drained = time.perf_counter() - started
+    return emitted, drained, Path(output).stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--output", help="Log file (default: a temporary file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = args.output or str(Path(tmp) / "bench.log")
+        print(f"{args.jobs} jobs, {args.workers} threads")
+        for mode in ("sync", "queue-verbose", "queue"):
+            emitted, drained, size = run(mode, args.jobs, args.workers, output)
+            print(
+                f"{mode:>14}: {args.jobs / emitted:>9.0f} jobs/s in workers, "
+                f"{args.jobs / drained:>9.0f} jobs/s incl. writes, {size / 1024:>7.1f} KiB logged"
+            )
+
+
+if __name__ == "__main__":
+    main()
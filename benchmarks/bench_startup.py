@@ -0,0 +1,91 @@
+"""
+Cold-start benchmark for the bot, Celery worker and scrape_jobs entry points.
+
+Each entry point is started in a fresh interpreter with ``-X importtime``.
+The script reports the median wall time and the slowest top-level imports.
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 8]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DJANGO_DIR = REPO_DIR / "scraper_api_service"
+
+ENTRY_POINTS = {
+    # Importing the module builds Bot and Dispatcher, which is all the
+    # bot does before polling.
+    "bot": (REPO_DIR, "import telegram_bot_service.bot"),
+    # What `celery -A scraper_api_service worker` does before consuming:
+    # configure Django and autodiscover tasks modules.
+    "worker": (
+        DJANGO_DIR,
+        "from scraper_api_service.celery import app; app.loader.import_default_modules()",
+    ),
+    # An empty ID range runs the full command path (settings, checks,
+    # imports) without touching the network or the database.
+    "scrape_jobs": (
+        DJANGO_DIR,
+        "import sys; sys.argv = ['manage.py', 'scrape_jobs', '--start', '2', '--end', '1'];"
+        "import manage; manage.main()",
+    ),
+}
+
+IMPORT_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def run_once(cwd, code):
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "benchmark")
+    env.setdefault("TELEGRAM_TOKEN", "123456:benchmark-token")
+    env.setdefault("DJANGO_SETTINGS_MODULE", "scraper_api_service.settings")
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    return elapsed, proc.stderr
+
+
+def top_level_imports(importtime_output):
+    """(module, cumulative microseconds) for imports made directly by the entry point."""
+    imports = []
+    for match in IMPORT_LINE_RE.finditer(importtime_output):
+        _, cumulative, indent, module = match.groups()
+        if not indent:
+            imports.append((module, int(cumulative)))
+    return sorted(imports, key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("entry_points", nargs="*", default=list(ENTRY_POINTS))
+    args = parser.parse_args()
+
+    for name in args.entry_points:
+        cwd, code = ENTRY_POINTS[name]
+        timings = []
+        output = ""
+        for _ in range(args.runs):
+            elapsed, output = run_once(cwd, code)
+            timings.append(elapsed)
+
+        print(f"{name}: median {statistics.median(timings) * 1000:.0f} ms over {args.runs} runs")
+        for module, cumulative in top_level_imports(output)[:args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Load test comparing the sync DRF API (WSGI) with the async read path (ASGI).
+
+Start both stacks first, for example:
+
+    cd scraper_api_service
+    python manage.py runserver 127.0.0.1:8000 --noreload
+    uvicorn scraper_api_service.asgi:application --port 8001
+
+then run
+
+    python benchmarks/load_test_api.py \
+        --target sync=http://127.0.0.1:8000/api/jobs \
+        --target async=http://127.0.0.1:8001/api/async/jobs \
+        --concurrency 200 --requests 5000
+
+Each target gets the same mix of list, paginated list, search and detail
+requests, the shapes the bot sends.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+SEARCH_TERMS = ["python", "senior", "react", "devops", "data", "marketing"]
+
+
+def request_mix(base_url, job_ids, count, seed=0):
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.4:
+            paths.append((f"{base_url}/", {"search": "", "page": 1}))
+        elif kind < 0.6:
+            paths.append((f"{base_url}/", {"search": "", "page": rng.randint(1, 5)}))
+        elif kind < 0.8:
+            paths.append((f"{base_url}/", {"search": rng.choice(SEARCH_TERMS), "page": 1}))
+        else:
+            paths.append((f"{base_url}/{rng.choice(job_ids)}/", None))
+    return paths
+
+
+async def run_target(name, base_url, concurrency, total):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        first_page = (await client.get(f"{base_url}/")).json()
+        job_ids = [job["id"] for job in first_page.get("results", [])] or [1]
+
+        queue = asyncio.Queue()
+        for item in request_mix(base_url, job_ids, total):
+            queue.put_nowait(item)
+
+        latencies = []
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            while True:
+                try:
+                    url, params = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    resp = await client.get(url, params=params)
+                    if resp.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:>8}: {total / elapsed:8.1f} req/s  "
+        f"p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--target", action="append", required=True,
+        help="name=base_url, e.g. async=http://127.0.0.1:8001/api/async/jobs",
+    )
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for target in args.target:
+        name, _, base_url = target.partition("=")
+        asyncio.run(run_target(name, base_url.rstrip("/"), args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Read-only async endpoints mirroring JobViewSet's list/detail/search responses.
+
+Served under ASGI (see scraper_api_service/asgi.py) so a single process can
+keep many bot requests in flight while they wait on Postgres.
+
+Queries use the async ORM (``acount()``, ``aget()``, ``async for``). Under
+ASGI each request runs them on a thread of its own, so nothing limits how many
+requests query at once: past DB_POOL_MAX_SIZE the extra threads would only
+queue inside psycopg_pool and fail after DB_POOL_TIMEOUT. ``db_slots`` caps
+the requests doing database work at the pool size; the rest wait on the event
+loop, which is cheap.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .views import JobViewSet
+
+db_slots = asyncio.Semaphore(settings.DATABASES["default"]["OPTIONS"].get("pool", {}).get("max_size", 10))
+
+
+@asynccontextmanager
+async def db_slot():
+    """Hold one of ``db_slots``, then hand the request's connection back to the pool."""
+    async with db_slots:
+        try:
+            yield
+        finally:
+            # Runs on the request's thread; CONN_MAX_AGE is 0 with DB_POOL, so
+            # the connection is free before the next request takes the slot.
+            await sync_to_async(close_old_connections)()
+
+
+def json_response(data, status=200):
+    # The renderer JobViewSet uses, so the bytes match /api/jobs/.
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def not_found(message):
+    # What DRF's exception handler renders for NotFound and Http404.
+    return json_response({"detail": NotFound(message).detail}, status=NotFound.status_code)
+
+
+def viewset(request, action, **kwargs):
+    view = JobViewSet(action=action, format_kwarg=None, kwargs=kwargs)
+    view.request = Request(request)
+    return view
+
+
+async def job_list(request):
+    """JobViewSet.list(): filter backends (search, ordering, collapse) and pagination."""
+    view = viewset(request, "list")
+    queryset = view.filter_queryset(view.get_queryset())
+    pagination = view.paginator
+    paginator = pagination.django_paginator_class(queryset, pagination.get_page_size(view.request))
+
+    async with db_slot():
+        # Paginator.count is cached, so page() and "?page=last" do not query it again.
+        paginator.count = await queryset.acount()
+        page_number = pagination.get_page_number(view.request, paginator)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            return not_found(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        page.object_list = [job async for job in page.object_list]
+
+    pagination.page, pagination.request = page, view.request
+    data = view.get_serializer(page.object_list, many=True).data
+    return json_response(pagination.get_paginated_response(data).data)
+
+
+async def job_detail(request, pk):
+    """JobViewSet.retrieve(), including its query-parameter filters."""
+    view = viewset(request, "retrieve", pk=pk)
+    queryset = view.filter_queryset(view.get_queryset())
+
+    async with db_slot():
+        try:
+            job = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            return not_found(f"No {queryset.model._meta.object_name} matches the given query.")
+
+    return json_response(view.get_serializer(job).data)
@@ -0,0 +1,44 @@
+"""
+Connection-pool metrics for scrape runs and API workers.
+
+psycopg_pool keeps one set of counters per process. They are read with
+``get_stats()`` and diffed against a snapshot: ``pop_stats()`` would reset
+them for every other reader in the process. Runs that overlap in one
+process (e.g. a threaded Celery pool) therefore each see the pool's total
+activity during their run, not only their own.
+"""
+from django.db import connection
+
+# Cumulative psycopg_pool counters; everything else in get_stats() is a gauge.
+COUNTERS = ("requests_num", "requests_queued", "requests_wait_ms", "requests_errors", "connections_num")
+
+
+def snapshot():
+    """The pool's raw counters, or None if pooling is off or no pool was opened yet."""
+    # Not ``connection.pool``: that property opens the pool if it does not exist.
+    pool = getattr(connection, "_connection_pools", {}).get(connection.alias)
+    return pool.get_stats() if pool is not None else None
+
+
+def pool_stats(baseline=None, stats=None):
+    """
+    Pool sizes and the request/wait counters between ``baseline`` and
+    ``stats`` (snapshots; ``stats`` defaults to now), or None without a pool.
+    """
+    stats = stats or snapshot()
+    if stats is None:
+        return None
+    baseline = baseline or {}
+    delta = {key: stats.get(key, 0) - baseline.get(key, 0) for key in COUNTERS}
+    requests_num = delta["requests_num"]
+    return {
+        "pool_size": stats.get("pool_size", 0),
+        "pool_available": stats.get("pool_available", 0),
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "connections_opened": delta["connections_num"],
+        "requests": requests_num,
+        "requests_queued": delta["requests_queued"],
+        "requests_errors": delta["requests_errors"],
+        "avg_wait_ms": round(delta["requests_wait_ms"] / requests_num, 2) if requests_num else 0,
+    }
+
@@ -0,0 +1,222 @@
+"""
+Repost detection for RemoteOK listings.
+
+RemoteOK reposts the same role under new IDs. Each job gets:
+
+* ``dedup_key`` - hash of the normalized title and company, catching exact
+  reposts;
+* ``minhash_signature`` - MinHash over word 3-shingles of title, company and
+  the start of the description, estimating Jaccard similarity;
+* ``lsh_buckets`` - banded LSH buckets of the signature. Jobs sharing any
+  bucket are near-duplicate candidates, so lookups hit a GIN index instead
+  of comparing against every row.
+
+A job whose signature is similar enough to an older canonical job from the
+same company is linked to it via ``Job.canonical``; a matching key only makes
+the older job a candidate, since distinct roles often share a generic title.
+Concurrent scrapes can save a repost before its original, so a job that is
+older than a matching canonical job takes over that job's group.
+The canonical job and its reposts form a group whose newest member is the
+one collapsed listings show (``Job.superseded`` is False only for it).
+"""
+import hashlib
+import html
+import random
+import re
+import struct
+import zlib
+
+from django.db import connection
+from django.db.models import Max, Q
+
+from .models import Job
+
+NUM_PERM = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+# With 8 bands of 4 rows a pair shares a bucket with probability
+# 1 - (1 - s**4)**8: about 98% at this threshold (s = 0.8), 67% at 0.6.
+# Candidates are then confirmed against the threshold.
+SIMILARITY_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+MAX_DESCRIPTION_CHARS = 2000
+MAX_TOKENS = 300
+
+# XOR with a random 32-bit mask permutes crc32 values; fixed seed so
+# signatures stay comparable across processes and releases.
+_rng = random.Random(1093848)
+PERMUTATION_MASKS = [_rng.getrandbits(32) for _ in range(NUM_PERM)]
+
+NON_WORD_RE = re.compile(r"[\W_]+")
+BAND_STRUCT = struct.Struct(f"{ROWS_PER_BAND}I")
+
+
+def normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    return NON_WORD_RE.sub(" ", html.unescape(text).lower()).strip()
+
+
+def dedup_key(title: str, company: str) -> str:
+    normalized = f"{normalize_text(title)}|{normalize_text(company)}"
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def minhash_signature(title: str, company: str, description: str) -> list:
+    text = f"{title or ''} {company or ''} {(description or '')[:MAX_DESCRIPTION_CHARS]}"
+    tokens = normalize_text(text).split()[:MAX_TOKENS]
+    if not tokens:
+        return [0] * NUM_PERM
+    shingles = {
+        " ".join(tokens[i:i + SHINGLE_SIZE]).encode()
+        for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))
+    }
+    hashes = list(map(zlib.crc32, shingles))
+    return [min(map(mask.__xor__, hashes)) for mask in PERMUTATION_MASKS]
+
+
+def lsh_buckets(signature: list) -> list:
+    """One bucket per band; the band number sits in the high bits so bands never collide."""
+    return [
+        (band << 32) | zlib.crc32(BAND_STRUCT.pack(*signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+        for band in range(BANDS)
+    ]
+
+
+def similarity(signature_a: list, signature_b: list) -> float:
+    if not signature_a or not signature_b:
+        return 0.0
+    return sum(a == b for a, b in zip(signature_a, signature_b)) / NUM_PERM
+
+
+def fingerprint(job_data: dict) -> dict:
+    """Dedup fields for a parsed job dict, ready to merge into Job defaults."""
+    signature = minhash_signature(
+        job_data.get("title", ""), job_data.get("company", ""), job_data.get("description", "")
+    )
+    return {
+        "dedup_key": dedup_key(job_data.get("title", ""), job_data.get("company", "")),
+        "minhash_signature": signature,
+        "lsh_buckets": lsh_buckets(signature),
+    }
+
+
+def is_repost(signature, company, other_signature, other_company) -> bool:
+    # The key only finds candidates: "Senior Software Engineer" at the same
+    # company can be several distinct roles, told apart by the description.
+    if normalize_text(company) != normalize_text(other_company):
+        return False
+    return similarity(signature, other_signature) >= SIMILARITY_THRESHOLD
+
+
+def find_matches(job):
+    """Canonical jobs other than ``job`` that are the same role, oldest first."""
+    candidates = (
+        Job.objects
+        .filter(canonical__isnull=True)
+        .exclude(pk=job.pk)
+        .filter(Q(dedup_key=job.dedup_key) | Q(lsh_buckets__overlap=job.lsh_buckets))
+        .only("id", "remoteok_id", "company", "minhash_signature")
+        .order_by("remoteok_id")
+    )
+    return [
+        candidate for candidate in candidates
+        if is_repost(job.minhash_signature, job.company, candidate.minhash_signature, candidate.company)
+    ]
+
+
+def refresh_group(group_id):
+    """Mark every member of the repost group ``group_id`` superseded except the newest."""
+    members = Job.objects.filter(Q(pk=group_id) | Q(canonical_id=group_id))
+    newest = members.aggregate(newest=Max("remoteok_id"))["newest"]
+    if newest is None:
+        return
+    members.filter(superseded=False).exclude(remoteok_id=newest).update(superseded=True)
+    members.filter(superseded=True, remoteok_id=newest).update(superseded=False)
+
+
+def link_canonical(job):
+    """
+    Put ``job`` in the group of the oldest matching job and return that
+    job's canonical, or None if ``job`` is the oldest.
+
+    Matching canonical jobs newer than the group's original are reposts that
+    were saved first; they and their reposts move to the original's group.
+    """
+    matches = find_matches(job)
+    canonical = matches[0] if matches and matches[0].remoteok_id < job.remoteok_id else None
+    canonical_id = canonical.id if canonical else None
+    root_id = canonical_id or job.id
+
+    merged_ids = [match.id for match in matches if match.id != root_id]
+    if canonical is not None and job.canonical_id is None:
+        # job was canonical itself; its reposts follow it.
+        merged_ids.append(job.id)
+    if merged_ids:
+        (
+            Job.objects
+            .filter(Q(pk__in=merged_ids) | Q(canonical_id__in=merged_ids))
+            .exclude(pk__in=[job.pk, root_id])
+            .update(canonical_id=root_id)
+        )
+
+    previous_id = job.canonical_id
+    if previous_id != canonical_id:
+        job.canonical_id = canonical_id
+        job.save(update_fields=["canonical"])
+        if previous_id is not None:
+            refresh_group(previous_id)
+    refresh_group(root_id)
+    return canonical
+
+
+# Same as migration 0005: newest member of each repost group stays visible.
+REFRESH_ALL_GROUPS_SQL = """
+UPDATE jobs_job AS job
+SET superseded = job.remoteok_id < newest.remoteok_id
+FROM (
+    SELECT COALESCE(canonical_id, id) AS group_id, MAX(remoteok_id) AS remoteok_id
+    FROM jobs_job
+    GROUP BY 1
+) AS newest
+WHERE COALESCE(job.canonical_id, job.id) = newest.group_id
+  AND job.superseded IS DISTINCT FROM (job.remoteok_id < newest.remoteok_id)
+"""
+
+
+def refresh_all_groups():
+    """Recompute ``superseded`` for every job; used after a full relink."""
+    with connection.cursor() as cursor:
+        cursor.execute(REFRESH_ALL_GROUPS_SQL)
+        return cursor.rowcount
+
+
+class RepostIndex:
+    """In-memory LSH index used by the batch backfill; jobs must be added oldest first."""
+
+    def __init__(self):
+        self.by_key = {}
+        self.by_bucket = {}
+        self.canonicals = {}
+
+    def add(self, job_id, remoteok_id, company, fields):
+        """Register a job and return the id of its canonical job, or None if it is canonical."""
+        key = fields["dedup_key"]
+        signature = fields["minhash_signature"]
+
+        candidate_ids = set()
+        if key in self.by_key:
+            candidate_ids.add(self.by_key[key])
+        for bucket in fields["lsh_buckets"]:
+            candidate_ids.update(self.by_bucket.get(bucket, ()))
+
+        for candidate_id in sorted(candidate_ids, key=lambda canonical_id: self.canonicals[canonical_id][0]):
+            _, other_signature, other_company = self.canonicals[candidate_id]
+            if is_repost(signature, company, other_signature, other_company):
+                return candidate_id
+
+        self.canonicals[job_id] = (remoteok_id, signature, company)
+        self.by_key.setdefault(key, job_id)
+        for bucket in fields["lsh_buckets"]:
+            self.by_bucket.setdefault(bucket, []).append(job_id)
+        return None
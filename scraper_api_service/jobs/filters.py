@@ -0,0 +1,32 @@
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that breaks ties on remoteok_id.
+
+    Many jobs share a posted_at/scraped_at (or have none), and rows that tie
+    come back in no fixed order, so pages could repeat or skip jobs. The
+    tie-breaker follows the direction of the first field, matching the
+    (-posted_at, -remoteok_id) and (-scraped_at, -remoteok_id) indexes.
+    """
+
+    tie_breaker = "remoteok_id"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or any(field.lstrip("-") == self.tie_breaker for field in ordering):
+            return ordering
+        direction = "-" if ordering[0].startswith("-") else ""
+        return [*ordering, direction + self.tie_breaker]
+
+
+class CollapseRepostsFilter(BaseFilterBackend):
+    """``?collapse=true`` shows each reposted role once, as its newest posting."""
+
+    collapse_param = "collapse"
+
+    def filter_queryset(self, request, queryset, view):
+        if request.query_params.get(self.collapse_param, "").lower() in ("1", "true", "yes"):
+            return queryset.filter(superseded=False)
+        return queryset
@@ -0,0 +1,152 @@
+"""
+Low-overhead logging for the scraper hot loop.
+
+``QueueListenerHandler`` is the root handler in settings.LOGGING: worker
+threads only append records to an in-memory queue and a background thread
+formats and writes them, so the console lock and stream I/O never stall a
+scrape. Records are queued unformatted; pass immutable values as arguments.
+
+Per-job outcomes are counted with ``count()`` and logged once per run by
+``run_summary()`` instead of as one INFO line per job, followed by the DB
+pool's activity during the run (see jobs.dbpool). The active summary is
+held in a ContextVar, so concurrent runs (e.g. a threaded Celery pool) each
+get their own; worker threads must run in a copy of the run's context
+(``contextvars.copy_context().run``). ``sampled_debug()`` keeps
+a sample (SCRAPER_LOG_SAMPLE_RATE) of per-job DEBUG lines for tracing.
+"""
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+from . import dbpool
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_active_summary = contextvars.ContextVar("jobs_log_run_summary", default=None)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Hand records to ``handlers`` on a background thread.
+
+    ``handlers`` are resolved by dictConfig, e.g. ``["cfg://handlers.console"]``.
+    Configure it with ``"()"`` rather than ``"class"``: on Python 3.12+
+    dictConfig builds ``"class"`` QueueHandlers with its own queue and
+    listener. A forked child (Celery prefork) gets a fresh queue and
+    listener thread.
+    """
+
+    def __init__(self, handlers):
+        super().__init__(None)
+        # Index access: dictConfig resolves "cfg://" entries in __getitem__, not when iterating.
+        self.targets = [handlers[i] for i in range(len(handlers))]
+        self.listener = None
+        self.closed = False
+        self.start()
+        os.register_at_fork(after_in_child=self.start)
+
+    def start(self):
+        if self.closed:
+            return
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, *self.targets, respect_handler_level=True)
+        self.listener.start()
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread; the default prepare()
+        # would format (and copy) the record in the caller.
+        return record
+
+    def close(self):
+        # logging.shutdown() closes this handler before the targets, so
+        # stopping here flushes everything still queued.
+        if not self.closed:
+            self.closed = True
+            self.listener.stop()
+        super().close()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in RECORD_ATTRS)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def sampled_debug(logger, msg, *args, **fields):
+    """Log a per-job DEBUG line for a SCRAPER_LOG_SAMPLE_RATE share of calls; ``fields`` go to ``extra``."""
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < settings.SCRAPER_LOG_SAMPLE_RATE:
+        logger.debug(msg, *args, extra=fields)
+
+
+class RunSummary:
+    """Thread-safe event counters for one run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.pool_baseline = dbpool.snapshot()
+
+    def count(self, event: str, n: int = 1):
+        with self.lock:
+            self.counts[event] += n
+
+    def log(self, logger):
+        seconds = time.perf_counter() - self.started
+        jobs = self.counts["processed"]
+        events = dict(sorted(self.counts.items()))
+        logger.info(
+            "📊 %s: %d jobs in %.1fs (%.1f jobs/s) %s",
+            self.name, jobs, seconds, jobs / seconds if seconds else 0.0,
+            ", ".join(f"{event}={n}" for event, n in events.items()),
+            extra={"run": self.name, "seconds": round(seconds, 3), "events": events},
+        )
+        pool_stats = dbpool.pool_stats(self.pool_baseline)
+        if pool_stats is not None:
+            logger.info("📊 %s DB pool: %s", self.name, pool_stats, extra={"run": self.name, "db_pool": pool_stats})
+
+
+def count(event: str, n: int = 1):
+    """Count ``event`` in the active run summary; a no-op outside one."""
+    summary = _active_summary.get()
+    if summary is not None:
+        summary.count(event, n)
+
+
+@contextmanager
+def run_summary(name: str, logger):
+    """Collect ``count()`` events from all threads and log them when the block exits."""
+    outer = _active_summary.get()
+    if outer is not None:
+        # Nested run (e.g. scrape_jobs inside a task); the outer one reports.
+        yield outer
+        return
+    summary = RunSummary(name)
+    token = _active_summary.set(summary)
+    try:
+        yield summary
+    finally:
+        _active_summary.reset(token)
+        summary.log(logger)
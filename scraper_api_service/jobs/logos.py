@@ -0,0 +1,106 @@
+"""
+Local cache of company logos as small JPEG thumbnails.
+
+Logos are downloaded once per URL at ingest (LogoSource maps each URL to its
+thumbnail), deduplicated by content hash (RemoteOK serves the same image under
+a new URL for every job) and served by the API with long-lived cache headers,
+so the bot never hands Telegram full-size remoteok.com images.
+"""
+import hashlib
+import io
+import logging
+
+import requests
+from django.core.files.base import ContentFile
+
+from .log import count
+from .models import CompanyLogo, LogoSource
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (100, 100)
+MAX_LOGO_BYTES = 5 * 1024 * 1024
+
+
+def download_logo(url: str):
+    from .utils2 import HEADERS
+
+    content = bytearray()
+    try:
+        with requests.get(url, headers=HEADERS, timeout=15, stream=True) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_content(64 * 1024):
+                content += chunk
+                if len(content) > MAX_LOGO_BYTES:
+                    count("logo_failed")
+                    logger.warning("⚠️ Logo %s is larger than %s bytes, skipped", url, MAX_LOGO_BYTES)
+                    return None
+    except requests.exceptions.RequestException as e:
+        count("logo_failed")
+        logger.warning("⚠️ Failed to download logo %s: %s", url, e)
+        return None
+    return bytes(content)
+
+
+def make_thumbnail(content: bytes) -> bytes:
+    """Fit the image into THUMBNAIL_SIZE and encode it as JPEG on a white background."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(content)) as image:
+        image.thumbnail(THUMBNAIL_SIZE)
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        out = io.BytesIO()
+        background.save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+def get_or_create_logo(url: str):
+    content = download_logo(url)
+    if not content:
+        return None
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    logo = CompanyLogo.objects.filter(content_hash=content_hash).first()
+    if logo:
+        return logo
+
+    try:
+        thumbnail = make_thumbnail(content)
+    except Exception as e:
+        count("logo_failed")
+        logger.warning("⚠️ Logo %s is not a usable image: %s", url, e)
+        return None
+    logo, _ = CompanyLogo.objects.get_or_create(
+        content_hash=content_hash,
+        defaults={"source_url": url, "thumbnail": ContentFile(thumbnail, name=f"{content_hash}.jpg")},
+    )
+    return logo
+
+
+def logo_for_url(url: str):
+    """Id of the cached logo for ``url``, downloading it the first time the URL is seen."""
+    # Re-scrapes keep the logo URL; reuse without downloading.
+    logo_id = LogoSource.objects.filter(url=url).values_list("logo_id", flat=True).first()
+    if logo_id is not None:
+        return logo_id
+
+    logo = get_or_create_logo(url)
+    if logo is None:
+        return None
+    source, _ = LogoSource.objects.get_or_create(url=url, defaults={"logo": logo})
+    return source.logo_id
+
+
+def attach_logo(job):
+    """Point ``job.logo`` at the cached thumbnail for ``job.company_logo``, refreshing it when the URL changed."""
+    logo_id = logo_for_url(job.company_logo) if job.company_logo else None
+    if logo_id is None and job.company_logo:
+        # Download failed; keep whatever the job had rather than dropping it.
+        return job.logo_id
+
+    if logo_id != job.logo_id:
+        job.logo_id = logo_id
+        job.save(update_fields=["logo"])
+    return logo_id
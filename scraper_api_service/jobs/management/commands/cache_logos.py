@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobs.logos import attach_logo
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Download and cache thumbnails for jobs that have a logo URL but no cached logo"
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.filter(logo__isnull=True).exclude(company_logo__isnull=True).exclude(company_logo="")
+        total = cached = 0
+        for job in jobs.only("id", "company_logo", "logo").iterator(chunk_size=500):
+            total += 1
+            if attach_logo(job):
+                cached += 1
+        self.stdout.write(self.style.SUCCESS(f"Cached logos for {cached} of {total} jobs"))
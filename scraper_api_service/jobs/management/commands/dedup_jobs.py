@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.dedup import RepostIndex, fingerprint, refresh_all_groups
+from jobs.models import Job
+
+DEDUP_FIELDS = ["dedup_key", "minhash_signature", "lsh_buckets", "canonical"]
+
+
+class Command(BaseCommand):
+    help = "Recompute repost fingerprints for all jobs and link reposts to their canonical job"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        index = RepostIndex()
+        started = time.perf_counter()
+        processed = reposts = 0
+        last_remoteok_id = None
+
+        # Keyset pagination in remoteok_id order, so older jobs become canonical.
+        queryset = Job.objects.only("id", "remoteok_id", "title", "company", "description").order_by("remoteok_id")
+        while True:
+            page = queryset if last_remoteok_id is None else queryset.filter(remoteok_id__gt=last_remoteok_id)
+            jobs = list(page[:batch_size])
+            if not jobs:
+                break
+
+            updates = []
+            for job in jobs:
+                fields = fingerprint({"title": job.title, "company": job.company, "description": job.description})
+                canonical_id = index.add(job.id, job.remoteok_id, job.company, fields)
+                updates.append(Job(id=job.id, canonical_id=canonical_id, **fields))
+                reposts += canonical_id is not None
+
+            with transaction.atomic():
+                Job.objects.bulk_update(updates, DEDUP_FIELDS)
+
+            processed += len(jobs)
+            last_remoteok_id = jobs[-1].remoteok_id
+            self.stdout.write(f"{processed} jobs processed, {reposts} reposts ({time.perf_counter() - started:.1f}s)")
+
+        superseded = refresh_all_groups()
+        self.stdout.write(f"{superseded} jobs changed their newest-in-group flag")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {processed} jobs, {reposts} reposts linked to "
+            f"{len(index.canonicals)} canonical jobs in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,153 @@
+import hashlib
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from jobs.models import CompanyLogo, Job, LogoSource
+from jobs.views import JobViewSet
+
+WORDS = [
+    "senior", "junior", "backend", "frontend", "python", "django", "react",
+    "devops", "data", "engineer", "developer", "manager", "designer", "support",
+    "marketing", "sales", "golang", "rust", "mobile", "product", "security",
+]
+COMPANIES = [f"{word.title()} {suffix}" for word in WORDS for suffix in ("Labs", "Inc", "GmbH", "Group")]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN ANALYZE over the API and scraper query shapes on a synthetic "
+        "dataset and fail if a query that should use an index falls back to a seq scan"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200_000, help="Synthetic jobs to insert")
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--search", default="python", help="Search term for the search query shape")
+        parser.add_argument("--keep", action="store_true", help="Keep the synthetic rows instead of rolling back")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print full plans for every query")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("explain_job_queries requires PostgreSQL")
+
+        failures = []
+        with transaction.atomic():
+            first_id = self.create_synthetic_jobs(options["rows"], options["batch_size"])
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE jobs_job")
+                cursor.execute("ANALYZE jobs_logosource")
+
+            for name, queryset, index_expected in self.query_shapes(first_id, options["search"]):
+                plan = queryset.explain(analyze=True, buffers=True)
+                seq_scan = "Seq Scan on jobs_" in plan
+                status = "SEQ SCAN" if seq_scan else "ok"
+                if seq_scan and index_expected:
+                    failures.append(name)
+                    style = self.style.ERROR
+                else:
+                    style = self.style.SUCCESS
+                self.stdout.write(style(f"[{status}] {name}: {plan_summary(plan)}"))
+                if options["verbose_plans"] or (seq_scan and index_expected):
+                    self.stdout.write(plan + "\n")
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+                self.stdout.write("Synthetic rows rolled back")
+
+        if failures:
+            raise CommandError(f"Sequential scans in indexed query shapes: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All query shapes use their indexes"))
+
+    def create_synthetic_jobs(self, rows, batch_size):
+        rng = random.Random(rows)
+        last_job = Job.objects.order_by("-remoteok_id").first()
+        first_id = (last_job.remoteok_id if last_job else 1090000) + 1
+        now = timezone.now()
+
+        self.stdout.write(f"Inserting {rows} synthetic jobs from remoteok_id {first_id}...")
+        logos = CompanyLogo.objects.bulk_create([
+            CompanyLogo(
+                content_hash=hashlib.sha256(f"{first_id}-{company}".encode()).hexdigest(),
+                source_url=f"https://remoteok.com/assets/img/jobs/{first_id}-{company}.png",
+                thumbnail=f"logos/{company}.jpg",
+            )
+            for company in COMPANIES
+        ])
+        batch = []
+        sources = []
+        for offset in range(rows):
+            remoteok_id = first_id + offset
+            title = " ".join(rng.sample(WORDS, 3)).title()
+            # About 5% of pages have no datePosted, mirroring parse_job_page.
+            posted_at = None if rng.random() < 0.05 else now - timedelta(minutes=rows - offset)
+            # RemoteOK serves each job's logo under its own URL.
+            logo = rng.choice(logos)
+            logo_url = f"https://remoteok.com/assets/img/jobs/{remoteok_id}.png"
+            sources.append(LogoSource(url=logo_url, logo=logo))
+            batch.append(Job(
+                remoteok_id=remoteok_id,
+                title=title,
+                company=rng.choice(COMPANIES),
+                company_logo=logo_url,
+                logo=logo,
+                description=f"{title}. " * 40,
+                short_description=title,
+                url=f"https://remoteok.com/remote-jobs/{remoteok_id}",
+                posted_at=posted_at,
+            ))
+            if len(batch) >= batch_size:
+                Job.objects.bulk_create(batch)
+                LogoSource.objects.bulk_create(sources)
+                batch, sources = [], []
+        if batch:
+            Job.objects.bulk_create(batch)
+            LogoSource.objects.bulk_create(sources)
+
+        # bulk_create stamps every row with the same auto_now_add value.
+        Job.objects.filter(remoteok_id__gte=first_id, posted_at__isnull=False).update(
+            scraped_at=F("posted_at") + timedelta(minutes=5)
+        )
+        return first_id
+
+    def query_shapes(self, first_id, search):
+        """(name, queryset, index_expected) for every hot query in the API and scraper."""
+        factory = APIRequestFactory()
+
+        def viewset_queryset(params):
+            view = JobViewSet(action="list", format_kwarg=None)
+            view.request = Request(factory.get("/api/jobs/", params))
+            return view.filter_queryset(view.get_queryset())
+
+        sample_id = first_id + 42
+        sample_pk = Job.objects.get(remoteok_id=sample_id).pk
+        return [
+            # utils2.scrape_jobs: high-water mark for the next incremental run.
+            ("scraper last id", Job.objects.order_by("-remoteok_id")[:1], True),
+            # utils2.save_job: update_or_create locks the row by remoteok_id.
+            ("scraper upsert lookup", Job.objects.select_for_update().filter(remoteok_id=sample_id), True),
+            ("api list page 1", viewset_queryset({})[:10], True),
+            ("api list page 50", viewset_queryset({})[490:500], True),
+            ("api list collapsed", viewset_queryset({"collapse": "true"})[:10], True),
+            # logos.logo_for_url: logo URL -> cached thumbnail on every save.
+            ("logo url lookup", LogoSource.objects.filter(url=f"https://remoteok.com/assets/img/jobs/{sample_id}.png"), True),
+            # dedup.refresh_group: members of one repost group on every save.
+            ("repost group members", Job.objects.filter(Q(pk=sample_pk) | Q(canonical_id=sample_pk)), True),
+            ("api detail", Job.objects.filter(pk=sample_pk), True),
+            ("api search", viewset_queryset({"search": search})[:10], True),
+            ("api search rare term", viewset_queryset({"search": "zzqx"})[:10], True),
+            ("api latest posted", viewset_queryset({"ordering": "-posted_at"})[:10], True),
+            ("api latest scraped", viewset_queryset({"ordering": "-scraped_at"})[:10], True),
+        ]
+
+
+def plan_summary(plan):
+    lines = plan.splitlines()
+    timing = [line.strip() for line in lines if line.startswith("Execution Time")]
+    return f"{lines[0].strip()} | {timing[0] if timing else ''}"
@@ -1,17 +1,31 @@
 from django.core.management.base import BaseCommand
+from jobs.profiling import profile_run
 from jobs.utils2 import scrape_jobs
 
 
 class Command(BaseCommand):
     help = "Scrape jobs from RemoteOK and store them in DB"
+    # System checks would import the whole URLconf just to start scraping.
+    requires_system_checks = []
 
     def add_arguments(self, parser):
         parser.add_argument("--start", type=int)
         parser.add_argument("--end", type=int)
+        parser.add_argument("--workers", type=int, default=5)
+        parser.add_argument("--window", type=int, help="Max job IDs in flight (default: 4 x workers)")
+        parser.add_argument("--profile", action="store_true", help="Profile the run and write a report to PROFILE_DIR")
+        parser.add_argument("--profile-top", type=int, default=25, help="Functions listed per stage and for the whole run in the profile summary")
 
     def handle(self, *args, **options):
-        result = scrape_jobs(
+        scrape_kwargs = dict(
             start_id=options.get("start"),
-            end_id=options.get("end")
+            end_id=options.get("end"),
+            max_workers=options["workers"],
+            window=options.get("window"),
         )
+        if options["profile"]:
+            with profile_run("scrape_jobs", top=options["profile_top"]):
+                result = scrape_jobs(**scrape_kwargs)
+        else:
+            result = scrape_jobs(**scrape_kwargs)
         self.stdout.write(self.style.SUCCESS(str(result)))
@@ -0,0 +1,125 @@
+import cProfile
+import logging
+import pstats
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from . import dbpool
+from .profiling import profile_dir, top_functions
+from .views import JobViewSet
+
+logger = logging.getLogger(__name__)
+
+
+class SampledProfilingMiddleware:
+    """
+    Profile a random sample of JobViewSet requests with cProfile.
+
+    Each sampled request writes ``<PROFILE_DIR>/requests/<timestamp>-<path>.prof``
+    and a ``.txt`` with the top functions, including serializer rendering.
+    Removed from the stack at startup when PROFILE_REQUESTS_SAMPLE_RATE is 0.
+    """
+
+    top = 25
+
+    def __init__(self, get_response):
+        self.rate = settings.PROFILE_REQUESTS_SAMPLE_RATE
+        if self.rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_interval = settings.PROFILE_REQUESTS_MIN_INTERVAL
+        self.lock = threading.Lock()
+        # Held while a request is profiled: only one profiler may be active
+        # per interpreter on Python 3.12+.
+        self.profiling = threading.Lock()
+        self.last_profiled = float("-inf")
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def should_profile(self, view_func):
+        if getattr(view_func, "cls", None) is not JobViewSet or random.random() >= self.rate:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_profiled < self.min_interval:
+                return False
+            self.last_profiled = now
+            return True
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.should_profile(view_func) or not self.profiling.acquire(blocking=False):
+            return None
+
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:
+                # Another profiler is active (e.g. a profiled scrape in this process).
+                logger.debug("Request not profiled: %s", e)
+                return None
+            try:
+                response = view_func(request, *view_args, **view_kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+            finally:
+                profiler.disable()
+                self.write(request, profiler)
+            return response
+        finally:
+            self.profiling.release()
+
+    def write(self, request, profiler):
+        output_dir = profile_dir() / "requests"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        slug = request.path.strip("/").replace("/", "_") or "root"
+        name = f"{timezone.now():%Y%m%d-%H%M%S-%f}-{slug}"
+
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(output_dir / f"{name}.prof")
+        (output_dir / f"{name}.txt").write_text(
+            f"{request.method} {request.get_full_path()}\n\n{top_functions(stats, self.top)}"
+        )
+        logger.info("📈 Request profile written to %s.prof", output_dir / name)
+
+
+class PoolStatsLogMiddleware:
+    """
+    Log this process's DB pool stats at most every DB_POOL_LOG_INTERVAL seconds.
+
+    The line is written after the first request past the interval, with the
+    counters since the previous line. Removed from the stack at startup when
+    the interval is 0 or DB_POOL is off.
+    """
+
+    def __init__(self, get_response):
+        self.interval = settings.DB_POOL_LOG_INTERVAL
+        if self.interval <= 0 or not settings.DB_POOL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.lock = threading.Lock()
+        self.baseline = None
+        self.next_log = time.monotonic() + self.interval
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if time.monotonic() >= self.next_log and self.lock.acquire(blocking=False):
+            try:
+                self.next_log = time.monotonic() + self.interval
+                self.log()
+            finally:
+                self.lock.release()
+        return response
+
+    def log(self):
+        current = dbpool.snapshot()
+        stats = dbpool.pool_stats(self.baseline, current)
+        self.baseline = current
+        if stats is not None:
+            logger.info("📊 API DB pool: %s", stats, extra={"db_pool": stats})
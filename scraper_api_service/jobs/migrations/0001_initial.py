@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('remoteok_id', models.IntegerField(unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('company', models.CharField(blank=True, max_length=255, null=True)),
+                ('company_logo', models.URLField(blank=True, max_length=500, null=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('short_description', models.TextField(blank=True, null=True)),
+                ('url', models.URLField(max_length=500)),
+                ('apply_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('posted_at', models.DateTimeField(blank=True, null=True)),
+                ('scraped_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
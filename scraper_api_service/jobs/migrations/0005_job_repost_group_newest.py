@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_company_logos'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_canonical_recent_idx',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='superseded',
+            field=models.BooleanField(default=False),
+        ),
+        # Only the newest job of each repost group stays visible when collapsed.
+        migrations.RunSQL(
+            """
+            UPDATE jobs_job AS job
+            SET superseded = TRUE
+            FROM (
+                SELECT COALESCE(canonical_id, id) AS group_id, MAX(remoteok_id) AS remoteok_id
+                FROM jobs_job
+                GROUP BY 1
+            ) AS newest
+            WHERE COALESCE(job.canonical_id, job.id) = newest.group_id
+              AND job.remoteok_id < newest.remoteok_id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('superseded', False)), fields=['-remoteok_id'], name='job_group_newest_recent_idx'),
+        ),
+    ]
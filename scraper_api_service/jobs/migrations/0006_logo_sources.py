@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_logo_sources(apps, schema_editor):
+    CompanyLogo = apps.get_model("jobs", "CompanyLogo")
+    Job = apps.get_model("jobs", "Job")
+    LogoSource = apps.get_model("jobs", "LogoSource")
+
+    pairs = dict(CompanyLogo.objects.values_list("source_url", "id"))
+    jobs = (
+        Job.objects
+        .filter(logo__isnull=False)
+        .exclude(company_logo__isnull=True).exclude(company_logo="")
+        .values_list("company_logo", "logo_id")
+        .distinct()
+    )
+    for url, logo_id in jobs.iterator(chunk_size=2000):
+        pairs.setdefault(url, logo_id)
+    LogoSource.objects.bulk_create(
+        [LogoSource(url=url, logo_id=logo_id) for url, logo_id in pairs.items()],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_repost_group_newest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogoSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, unique=True)),
+                ('logo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sources', to='jobs.companylogo')),
+            ],
+        ),
+        migrations.RunPython(backfill_logo_sources, migrations.RunPython.noop),
+    ]
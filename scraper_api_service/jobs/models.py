@@ -1,4 +1,30 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+
+class CompanyLogo(models.Model):
+    """A company logo thumbnail, stored once per distinct image content."""
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    source_url = models.URLField(max_length=500)
+    thumbnail = models.FileField(upload_to="logos/")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.content_hash
+
+
+class LogoSource(models.Model):
+    """A logo URL seen on RemoteOK and the cached thumbnail its image resolved to."""
+
+    url = models.URLField(max_length=500, unique=True)
+    logo = models.ForeignKey(CompanyLogo, on_delete=models.CASCADE, related_name="sources")
+
+    def __str__(self):
+        return self.url
 
 
 class Job(models.Model):
@@ -7,6 +33,9 @@ class Job(models.Model):
     title = models.CharField(max_length=255)
     company = models.CharField(max_length=255, null=True, blank=True)
     company_logo = models.URLField(max_length=500, null=True, blank=True)
+    logo = models.ForeignKey(
+        CompanyLogo, null=True, blank=True, on_delete=models.SET_NULL, related_name="jobs"
+    )
 
     description = models.TextField(null=True, blank=True)
     short_description = models.TextField(null=True, blank=True)
@@ -17,5 +46,36 @@ class Job(models.Model):
     posted_at = models.DateTimeField(null=True, blank=True)
     scraped_at = models.DateTimeField(auto_now_add=True)
 
+    # Repost detection, see jobs.dedup. A job with canonical set is a repost
+    # of that (older) job; canonical jobs have it empty.
+    dedup_key = models.CharField(max_length=40, blank=True, default="", db_index=True)
+    minhash_signature = ArrayField(models.BigIntegerField(), blank=True, default=list)
+    lsh_buckets = ArrayField(models.BigIntegerField(), blank=True, default=list)
+    canonical = models.ForeignKey(
+        "self", null=True, blank=True, on_delete=models.SET_NULL, related_name="reposts"
+    )
+    # A newer job of the same repost group exists; collapsed listings show
+    # only the newest one.
+    superseded = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # "Latest" listings ordered by posting/scrape time, with remoteok_id
+            # as the tie-breaker so paginated results stay stable.
+            models.Index(fields=["-posted_at", "-remoteok_id"], name="job_posted_at_recent_idx"),
+            models.Index(fields=["-scraped_at", "-remoteok_id"], name="job_scraped_at_recent_idx"),
+            # SearchFilter runs UPPER(col::text) LIKE UPPER('%term%'); trigram
+            # indexes on the same expressions let Postgres avoid a full scan.
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="job_title_trgm_idx"),
+            GinIndex(OpClass(Upper("company"), name="gin_trgm_ops"), name="job_company_trgm_idx"),
+            GinIndex(fields=["lsh_buckets"], name="job_lsh_buckets_idx"),
+            # Collapsed listings show the newest job of each repost group.
+            models.Index(
+                fields=["-remoteok_id"],
+                condition=Q(superseded=False),
+                name="job_group_newest_recent_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title} @ {self.company or 'Unknown'}"
@@ -0,0 +1,210 @@
+"""
+Opt-in profiling for scrape runs and API requests.
+
+``profile_run`` wraps a whole scrape with one profiler: pyinstrument when it
+is installed (a sampling profiler, cheap enough for long runs; it samples the
+calling thread) and cProfile otherwise. If another profiler is already
+running the run continues unprofiled.
+
+Worker threads mark their work with ``stage("fetch")`` etc., which records
+per-stage call counts and wall time. The session is held in a ContextVar, so
+workers must run in a copy of the caller's context. Outside a profiled run
+``stage`` costs one ContextVar lookup.
+
+Function-level data per stage depends on the interpreter. Before Python
+3.12 a cProfile only sees the thread that enabled it, so the run profile
+shows the calling thread waiting on futures; each worker thread therefore
+gets its own cProfile per stage, merged per stage when the run ends. On
+3.12+ only one cProfile may be active per interpreter, but it sees every
+thread: with cProfile as the run profiler the worker code is in the run
+profile, not split by stage.
+
+Output goes to ``<PROFILE_DIR>/<name>-<timestamp>/``: ``summary.txt`` with
+the stage totals and top-N functions per stage and for the run, plus
+``stage-<name>.prof`` and ``run.prof`` (open with ``python -m pstats`` or
+snakeviz) or ``run.html`` from pyinstrument.
+"""
+import contextvars
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_active_session = contextvars.ContextVar("jobs_profiling_session", default=None)
+
+# A cProfile per worker thread and stage; see the module docstring.
+STAGE_PROFILES = sys.version_info < (3, 12)
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+def top_functions(stats: pstats.Stats, top: int) -> str:
+    out = io.StringIO()
+    stats.stream = out
+    stats.sort_stats("cumulative").print_stats(top)
+    return out.getvalue()
+
+
+class ProfileSession:
+    def __init__(self, name: str, output_dir: Path, top: int = 25):
+        self.name = name
+        self.output_dir = output_dir
+        self.top = top
+        self.lock = threading.Lock()
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        # stage -> one cProfile per thread that ran it
+        self.stage_profilers = defaultdict(list)
+        self.local = threading.local()
+        # Thread the run profiler hooks; a stage profiler there would replace its hook.
+        self.run_thread = None
+
+    def stage_profiler(self, name: str):
+        """This thread's profiler for stage ``name``, or None if the stage is not profiled here."""
+        if not STAGE_PROFILES or threading.get_ident() == self.run_thread or getattr(self.local, "busy", False):
+            # Nested stages count towards the outer stage's profile.
+            return None
+        profilers = self.local.__dict__.setdefault("profilers", {})
+        if name not in profilers:
+            profilers[name] = cProfile.Profile()
+            with self.lock:
+                self.stage_profilers[name].append(profilers[name])
+        return profilers[name]
+
+    @contextmanager
+    def stage(self, name: str):
+        profiler = self.stage_profiler(name)
+        if profiler is not None:
+            try:
+                profiler.enable()
+                self.local.busy = True
+            except ValueError:
+                profiler = None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                self.local.busy = False
+            with self.lock:
+                self.stage_seconds[name] += elapsed
+                self.stage_calls[name] += 1
+
+    def stage_report(self, name: str):
+        """Dump the merged profile of stage ``name`` and return its top functions, or None."""
+        stats = None
+        for profiler in self.stage_profilers.get(name, ()):
+            try:
+                stats = pstats.Stats(profiler) if stats is None else stats.add(profiler)
+            except TypeError:
+                # Never enabled, e.g. another profiler was active.
+                continue
+        if stats is None:
+            return None
+        stats.dump_stats(self.output_dir / f"stage-{name}.prof")
+        return top_functions(stats, self.top)
+
+    def write(self, run_summary: str, run_seconds: float):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        names = sorted(self.stage_seconds, key=self.stage_seconds.get, reverse=True)
+        lines = [f"{self.name}: {run_seconds:.2f}s wall", ""]
+        for name in names:
+            calls, seconds = self.stage_calls[name], self.stage_seconds[name]
+            lines.append(f"stage {name}: {calls} calls, {seconds:.2f}s total, {seconds / calls * 1000:.1f} ms avg")
+        if not STAGE_PROFILES:
+            lines += ["", "(Python 3.12+: worker functions are in the run profile, not split by stage)"]
+        for name in names:
+            report = self.stage_report(name)
+            if report is not None:
+                lines += ["", f"=== stage {name} ===", report]
+        lines += ["", "=== run ===", run_summary]
+        (self.output_dir / "summary.txt").write_text("\n".join(lines))
+
+
+def start_profiler():
+    """
+    Start pyinstrument, or cProfile without it, and return ``(kind, profiler)``.
+
+    Returns ``(None, None)`` if another profiler is already active.
+    """
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    try:
+        if Profiler:
+            profiler = Profiler()
+            profiler.start()
+            return "pyinstrument", profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return "cprofile", profiler
+    except (RuntimeError, ValueError) as e:
+        # e.g. "Another profiling tool is already active" on Python 3.12+
+        logger.warning("⚠️ Profiler not started: %s", e)
+        return None, None
+
+
+@contextmanager
+def stage(name: str):
+    session = _active_session.get()
+    if session is None:
+        yield
+        return
+    with session.stage(name):
+        yield
+
+
+@contextmanager
+def profile_run(name: str, top: int = 25, output_dir=None):
+    """Profile everything inside the block and write the report on exit."""
+    if _active_session.get() is not None:
+        # Nested profiled run; profile only the outer one.
+        yield None
+        return
+
+    output_dir = Path(output_dir or profile_dir()) / f"{name}-{timezone.now():%Y%m%d-%H%M%S}"
+    session = ProfileSession(name, output_dir, top)
+    started = time.perf_counter()
+    kind, profiler = start_profiler()
+    if kind is not None:
+        session.run_thread = threading.get_ident()
+    token = _active_session.set(session)
+    try:
+        yield session
+    finally:
+        _active_session.reset(token)
+        if kind == "pyinstrument":
+            profiler.stop()
+        elif kind == "cprofile":
+            profiler.disable()
+        run_seconds = time.perf_counter() - started
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if kind == "pyinstrument":
+            (output_dir / "run.html").write_text(profiler.output_html())
+            run_summary = profiler.output_text()
+        elif kind == "cprofile":
+            stats = pstats.Stats(profiler)
+            stats.dump_stats(output_dir / "run.prof")
+            run_summary = top_functions(stats, top)
+        else:
+            run_summary = "(not profiled: another profiler was active)"
+        session.write(run_summary, run_seconds)
+        logger.info("📈 Profile written to %s", output_dir)
@@ -1,7 +1,19 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Job
 
 class JobSerializer(serializers.ModelSerializer):
+    company_logo_thumb = serializers.SerializerMethodField()
+
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ['minhash_signature', 'lsh_buckets', 'logo', 'superseded']
+
+    def get_company_logo_thumb(self, job):
+        # Without a public origin the URL would point at whatever host the bot
+        # called (e.g. 127.0.0.1), which Telegram cannot fetch; clients fall
+        # back to company_logo.
+        if not job.logo_id or not settings.LOGO_BASE_URL:
+            return None
+        return settings.LOGO_BASE_URL.rstrip("/") + reverse("logo-thumbnail", args=[job.logo_id])
@@ -1,7 +1,68 @@
 
 from celery import shared_task
-from .utils2 import scrape_jobs
+
+# Scraper modules (bs4, requests, redis) are imported inside the tasks so
+# autodiscovery at worker startup stays cheap.
+
+
+@shared_task
+def scrape_latest_jobs(profile=False):
+    """Daily backstop: scan the IDs between its checkpoint and the watcher's mark."""
+    from .utils2 import scrape_jobs
+    from .watcher import advance_backstop_checkpoint, backstop_range
+
+    start_id, end_id = backstop_range()
+    if start_id > end_id:
+        return {"status": "no new jobs"}
+
+    if profile:
+        from .profiling import profile_run
+
+        with profile_run("scrape_latest_jobs"):
+            result = scrape_jobs(start_id=start_id, end_id=end_id, skip_existing=True)
+    else:
+        result = scrape_jobs(start_id=start_id, end_id=end_id, skip_existing=True)
+
+    if result.get("status") in ("done", "cancelled"):
+        advance_backstop_checkpoint(result.get("next_id", end_id + 1) - 1)
+    return result
+
 
 @shared_task
-def scrape_latest_jobs():
-    return scrape_jobs()
+def scrape_job_ids(job_ids):
+    from .log import count, run_summary
+    from .utils2 import logger, scrape_job_wrapper
+    from .watcher import claim_job_ids, mark_job_done, mark_job_failed
+
+    # IDs another batch is still scraping (enqueued again by a later tick) are skipped.
+    job_ids = claim_job_ids(job_ids)
+    saved = 0
+    with run_summary("scrape_job_ids", logger):
+        for job_id in job_ids:
+            count("processed")
+            try:
+                ok = scrape_job_wrapper(job_id)
+            except Exception as e:
+                # One bad page must not drop the rest of the batch.
+                count("failed")
+                logger.exception("❌ Job %s failed: %s", job_id, e, extra={"job_id": job_id})
+                ok = False
+            if ok:
+                saved += 1
+                mark_job_done(job_id)
+            else:
+                mark_job_failed(job_id)
+    return {"status": "done", "processed": len(job_ids), "saved": saved}
+
+
+@shared_task
+def watch_new_jobs():
+    from .watcher import check_for_new_jobs, pending_job_ids
+
+    new_ids = check_for_new_jobs()
+    # New IDs plus earlier ones that failed or whose batch was lost; IDs
+    # leased by a batch that is still running are left to it.
+    job_ids = pending_job_ids()
+    if job_ids:
+        scrape_job_ids.delay(job_ids)
+    return {"new_ids": new_ids, "enqueued": job_ids}
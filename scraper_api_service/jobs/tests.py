@@ -1,3 +1,670 @@
-from django.test import TestCase
+import contextvars
+import io
+import json
+import logging
+import logging.config
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.request import Request
+
+from . import async_views, dbpool, dedup, log, logos, profiling, watcher
+from .models import CompanyLogo, Job
+from .serializers import JobSerializer
+from .utils2 import clean_description, scrape_jobs
+from .views import JobViewSet
+
+REPO_DIR = settings.BASE_DIR.parent
+
+
+def reference_clean_description(text: str) -> str:
+    """The original multi-pass implementation, kept as the equivalence oracle."""
+    if not text:
+        return ""
+    text = text.replace("\xa0", " ").replace("\t", " ")
+    text = re.sub(r"\s*\n\s*", "\n", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{2,}", "\n\n", text)
+    return text.strip()
+
+
+def load_description_corpus():
+    corpus = []
+    with open(REPO_DIR / "api.json", encoding="utf-8") as f:
+        for job in json.load(f)[1:]:
+            corpus.append(job.get("description", ""))
+            corpus.append(job.get("position", ""))
+
+    with open(REPO_DIR / "job.html", encoding="utf-8") as f:
+        html = f.read()
+    soup = BeautifulSoup(html, "html.parser")
+    desc_tag = soup.find("div", {"class": "markdown"})
+    if desc_tag:
+        corpus.append(desc_tag.get_text(strip=True, separator="\n"))
+    for script in soup.find_all("script", {"type": "application/ld+json"}):
+        corpus.append(script.string or "")
+    corpus.append(html)
+    return corpus
+
+
+class CleanDescriptionTests(SimpleTestCase):
+    WHITESPACE_ALPHABET = " \t\n\r\x0b\x0c\xa0 　\x85 "
+
+    def test_matches_reference_on_corpus(self):
+        for text in load_description_corpus():
+            self.assertEqual(clean_description(text), reference_clean_description(text))
+
+    def test_matches_reference_on_random_whitespace(self):
+        rng = random.Random(20250818)
+        alphabet = self.WHITESPACE_ALPHABET + "ab\n\n  "
+        for _ in range(20000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+            self.assertEqual(clean_description(text), reference_clean_description(text), repr(text))
+
+    def test_matches_reference_on_mutated_corpus(self):
+        rng = random.Random(1093848)
+        corpus = [text for text in load_description_corpus() if text][:50]
+        for text in corpus:
+            chars = list(text[:2000])
+            for _ in range(len(chars) // 10):
+                chars.insert(rng.randrange(len(chars) + 1), rng.choice(self.WHITESPACE_ALPHABET))
+            mutated = "".join(chars)
+            self.assertEqual(clean_description(mutated), reference_clean_description(mutated))
+
+    def test_empty_values(self):
+        self.assertEqual(clean_description(""), "")
+        self.assertEqual(clean_description(None), "")
+        self.assertEqual(clean_description(" \n\t\xa0 "), "")
+
+
+class RepostDetectionTests(SimpleTestCase):
+    def setUp(self):
+        with open(REPO_DIR / "api.json", encoding="utf-8") as f:
+            self.jobs = [
+                {"title": job["position"], "company": job["company"], "description": job["description"]}
+                for job in json.load(f)[1:]
+            ]
+
+    def test_dedup_key_ignores_case_punctuation_and_entities(self):
+        self.assertEqual(
+            dedup.dedup_key("Senior Python Engineer &amp; Lead", "Acme, Inc."),
+            dedup.dedup_key("senior python engineer & lead!", "ACME Inc"),
+        )
+        self.assertNotEqual(dedup.dedup_key("Python Engineer", "Acme"), dedup.dedup_key("Go Engineer", "Acme"))
+
+    def test_lightly_edited_repost_shares_bucket_and_passes_threshold(self):
+        job = max(self.jobs, key=lambda job: len(job["description"]))
+        repost = dict(job, title=job["title"] + " (Remote)", description=job["description"].replace(" and ", " & ", 2))
+        original, edited = dedup.fingerprint(job), dedup.fingerprint(repost)
+
+        self.assertNotEqual(original["dedup_key"], edited["dedup_key"])
+        self.assertTrue(set(original["lsh_buckets"]) & set(edited["lsh_buckets"]))
+        self.assertGreaterEqual(
+            dedup.similarity(original["minhash_signature"], edited["minhash_signature"]),
+            dedup.SIMILARITY_THRESHOLD,
+        )
+
+    def test_repost_index_links_reposts_to_oldest_job(self):
+        index = dedup.RepostIndex()
+        job = self.jobs[0]
+        self.assertIsNone(index.add(1, 100, job["company"], dedup.fingerprint(job)))
+        self.assertEqual(index.add(2, 101, job["company"], dedup.fingerprint(job)), 1)
+        # Same text under another company is not a repost.
+        self.assertIsNone(index.add(3, 102, "Other Co", dedup.fingerprint(dict(job, company="Other Co"))))
+
+    def test_distinct_listings_are_not_merged(self):
+        index = dedup.RepostIndex()
+        canonical_ids = [
+            index.add(job_id, job_id, job["company"], dedup.fingerprint(job))
+            for job_id, job in enumerate(self.jobs)
+        ]
+        # The fixture has one repost (Greenlight's "Software Engineer II, Full
+        # Stack") and two blank listings that share a key but not a description.
+        greenlight = [
+            job_id for job_id, job in enumerate(self.jobs) if job["company"] == "Greenlight Financial Technology"
+            and job["title"].lower() == "software engineer ii full stack"
+        ]
+        self.assertEqual(len(index.canonicals), len(self.jobs) - 1)
+        self.assertEqual(canonical_ids.count(None), len(self.jobs) - 1)
+        self.assertEqual(canonical_ids[greenlight[1]], greenlight[0])
+
+    def test_same_key_with_a_different_description_is_not_a_repost(self):
+        job = self.jobs[0]
+        other = max(self.jobs, key=lambda other: len(other["description"]))
+        original, same_title = dedup.fingerprint(job), dedup.fingerprint(dict(other, title=job["title"], company=job["company"]))
+
+        self.assertEqual(original["dedup_key"], same_title["dedup_key"])
+        self.assertFalse(dedup.is_repost(
+            original["minhash_signature"], job["company"], same_title["minhash_signature"], job["company"],
+        ))
+
+    def test_original_saved_after_its_repost_takes_over_the_group(self):
+        original = Job(id=1, remoteok_id=100)
+        early_repost = Job(id=2, remoteok_id=101)
+        with mock.patch.object(dedup, "find_matches", return_value=[early_repost]), \
+                mock.patch.object(dedup.Job.objects, "filter") as members, \
+                mock.patch.object(dedup, "refresh_group") as refresh_group, \
+                mock.patch.object(Job, "save") as save:
+            self.assertIsNone(dedup.link_canonical(original))
+
+        # The repost and anything linked to it now belong to the original.
+        members.return_value.exclude.return_value.update.assert_called_once_with(canonical_id=1)
+        save.assert_not_called()
+        refresh_group.assert_called_once_with(1)
+
+    def test_canonical_job_that_turns_out_to_be_a_repost_brings_its_reposts(self):
+        job = Job(id=3, remoteok_id=102)
+        with mock.patch.object(dedup, "find_matches", return_value=[Job(id=1, remoteok_id=100)]), \
+                mock.patch.object(dedup.Job.objects, "filter") as members, \
+                mock.patch.object(dedup, "refresh_group") as refresh_group, \
+                mock.patch.object(Job, "save") as save:
+            self.assertEqual(dedup.link_canonical(job).id, 1)
+
+        self.assertEqual(job.canonical_id, 1)
+        save.assert_called_once_with(update_fields=["canonical"])
+        members.return_value.exclude.return_value.update.assert_called_once_with(canonical_id=1)
+        refresh_group.assert_called_once_with(1)
+
+
+class ScrapeSchedulerTests(SimpleTestCase):
+    RESULT_SIZE = 200_000
+
+    def fake_wrapper(self, job_id):
+        with self.lock:
+            self.calls += 1
+            if self.calls == self.stop_after:
+                self.stop_event.set()
+        time.sleep(0.001)
+        # A large result, like the job dicts the old wrapper returned.
+        return bytearray(self.RESULT_SIZE)
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.stop_after = None
+        self.stop_event = threading.Event()
+        patcher = mock.patch("jobs.utils2.scrape_job_wrapper", side_effect=self.fake_wrapper)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_memory_is_flat_in_range_size(self):
+        window = 10
+        tracemalloc.start()
+        try:
+            result = scrape_jobs(start_id=1, end_id=1500, max_workers=4, window=window)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(result["status"], "done")
+        self.assertEqual(result["processed"], 1500)
+        self.assertEqual(self.calls, 1500)
+        # Submitting everything up front would retain 1500 results (~300 MB).
+        self.assertLess(peak, 3 * window * self.RESULT_SIZE)
+
+    def test_stop_event_drains_in_flight_jobs_and_reports_resume_point(self):
+        self.stop_after = 30
+        window = 8
+        result = scrape_jobs(start_id=100, end_id=10_000, max_workers=4, window=window, stop_event=self.stop_event)
+
+        self.assertEqual(result["status"], "cancelled")
+        self.assertLessEqual(self.calls, self.stop_after + window)
+        self.assertEqual(result["processed"], self.calls)
+        self.assertEqual(result["next_id"], 100 + self.calls)
+
+
+class FakeRedis:
+    def __init__(self, **values):
+        self.values = {key: str(value) for key, value in values.items()}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False):
+        if not (nx and key in self.values):
+            self.values[key] = str(value)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if script == watcher.CLAIM_SCRIPT:
+            pending, leases = (self.values.setdefault(key, {}) for key in keys)
+            now, per_job, claimed = float(args[0]), float(args[1]), []
+            for job_id in map(str, args[2:]):
+                if job_id in pending and float(leases.get(job_id, 0)) <= now:
+                    claimed.append(job_id)
+                    leases[job_id] = now + per_job * len(claimed)
+            return claimed
+        key, value = keys[0], args[0]
+        self.values[key] = str(max(int(self.values.get(key, 0)), int(value)))
+
+    def hsetnx(self, key, field, value):
+        self.values.setdefault(key, {}).setdefault(str(field), int(value))
+
+    def hincrby(self, key, field, amount):
+        hash_ = self.values.setdefault(key, {})
+        hash_[str(field)] = hash_.get(str(field), 0) + amount
+        return hash_[str(field)]
+
+    def hdel(self, key, field):
+        self.values.get(key, {}).pop(str(field), None)
+
+    def hkeys(self, key):
+        return list(self.values.get(key, {}))
+
+    def hgetall(self, key):
+        return {field: str(value) for field, value in self.values.get(key, {}).items()}
+
+
+class ListingWatcherTests(SimpleTestCase):
+    LISTING = """
+        <table>
+          <tr class="job" data-id="1093850"></tr>
+          <tr class="job" data-id="1093848"></tr>
+          <tr class="job" data-id="1093849"></tr>
+          <tr class="job" data-id="1093700"></tr>
+          <tr class="expand"></tr>
+        </table>
+    """
+
+    def check(self, client, status_code=200, headers=None):
+        resp = mock.Mock(status_code=status_code, text=self.LISTING, headers=headers or {})
+        with mock.patch.object(watcher, "get_redis", return_value=client), \
+                mock.patch.object(watcher.requests, "get", return_value=resp) as get:
+            return watcher.check_for_new_jobs(), get.call_args.kwargs["headers"]
+
+    def test_returns_only_listed_ids_above_high_water_mark(self):
+        client = FakeRedis(**{watcher.HIGH_WATER_MARK_KEY: 1093848})
+        new_ids, _ = self.check(client, headers={"ETag": '"abc"'})
+
+        self.assertEqual(new_ids, [1093849, 1093850])
+        self.assertEqual(client.get(watcher.HIGH_WATER_MARK_KEY), "1093850")
+        self.assertEqual(client.hkeys(watcher.PENDING_KEY), ["1093849", "1093850"])
+        self.assertEqual(client.get(watcher.ETAG_KEY), '"abc"')
+
+        # The next tick sends the validator and a 304 enqueues nothing.
+        new_ids, headers = self.check(client, status_code=304)
+        self.assertEqual(new_ids, [])
+        self.assertEqual(headers["If-None-Match"], '"abc"')
+
+    def test_failed_ids_stay_pending_without_aborting_the_batch(self):
+        from .tasks import scrape_job_ids
+
+        client = FakeRedis()
+        for job_id in (1, 2, 3):
+            client.hsetnx(watcher.PENDING_KEY, job_id, 0)
+        outcomes = {1: ValueError("Invalid isoformat string"), 2: True, 3: None}
+
+        def wrapper(job_id):
+            if isinstance(outcomes[job_id], Exception):
+                raise outcomes[job_id]
+            return outcomes[job_id]
+
+        with mock.patch.object(watcher, "get_redis", return_value=client), \
+                mock.patch("jobs.utils2.scrape_job_wrapper", side_effect=wrapper):
+            result = scrape_job_ids([1, 2, 3])
+            self.assertEqual(result["saved"], 1)
+            self.assertEqual(watcher.pending_job_ids(), [1, 3])
+
+            # Retried on later ticks, then left to the backstop.
+            for _ in range(watcher.MAX_ATTEMPTS - 1):
+                scrape_job_ids([1, 3])
+            self.assertEqual(watcher.pending_job_ids(), [])
+
+    def test_ids_leased_by_a_running_batch_are_not_scraped_twice(self):
+        from .tasks import scrape_job_ids, watch_new_jobs
+
+        client = FakeRedis()
+        for job_id in (1, 2):
+            client.hsetnx(watcher.PENDING_KEY, job_id, 0)
+        scraped = []
+
+        def wrapper(job_id):
+            if job_id == 1:
+                # A later tick fires while this batch is still on job 1.
+                with mock.patch.object(scrape_job_ids, "delay") as delay:
+                    watch_new_jobs()
+                self.assertFalse(delay.called)
+                # A duplicate batch that was already queued skips both IDs.
+                self.assertEqual(scrape_job_ids([1, 2])["processed"], 0)
+            scraped.append(job_id)
+            return job_id == 2
+
+        with mock.patch.object(watcher, "get_redis", return_value=client), \
+                mock.patch.object(watcher, "check_for_new_jobs", return_value=[]), \
+                mock.patch("jobs.utils2.scrape_job_wrapper", side_effect=wrapper):
+            scrape_job_ids([1, 2])
+            self.assertEqual(scraped, [1, 2])
+            # Job 1 failed once and its lease is released for the next tick.
+            self.assertEqual(client.values[watcher.PENDING_KEY], {"1": 1})
+            self.assertEqual(watcher.pending_job_ids(), [1])
+
+            # A batch lost with its worker is retried once the lease runs out.
+            self.assertEqual(watcher.claim_job_ids([1]), [1])
+            self.assertEqual(watcher.pending_job_ids(), [])
+            with mock.patch.object(watcher.time, "time", return_value=time.time() + watcher.LEASE_SECONDS_PER_JOB + 1):
+                self.assertEqual(watcher.pending_job_ids(), [1])
+
+    def test_backstop_scans_from_its_checkpoint_to_the_mark(self):
+        from .tasks import scrape_latest_jobs
+
+        client = FakeRedis(**{watcher.HIGH_WATER_MARK_KEY: 1093850, watcher.BACKSTOP_CHECKPOINT_KEY: 1093700})
+        with mock.patch.object(watcher, "get_redis", return_value=client), \
+                mock.patch("jobs.utils2.scrape_jobs", return_value={"status": "done"}) as scrape:
+            scrape_latest_jobs()
+            scrape.assert_called_once_with(start_id=1093701, end_id=1093850, skip_existing=True)
+            self.assertEqual(client.get(watcher.BACKSTOP_CHECKPOINT_KEY), "1093850")
+
+            # Nothing new since the last run.
+            self.assertEqual(scrape_latest_jobs(), {"status": "no new jobs"})
+
+
+class LogoThumbnailTests(SimpleTestCase):
+    def test_thumbnail_is_small_opaque_jpeg(self):
+        from PIL import Image
+
+        source = io.BytesIO()
+        Image.new("RGBA", (640, 320), (10, 20, 30, 0)).save(source, format="PNG")
+
+        thumbnail = Image.open(io.BytesIO(logos.make_thumbnail(source.getvalue())))
+        self.assertEqual(thumbnail.format, "JPEG")
+        self.assertEqual(thumbnail.size, (100, 50))
+        # Transparent pixels end up white rather than black.
+        self.assertEqual(thumbnail.getpixel((50, 25)), (255, 255, 255))
+
+    def test_attach_logo_looks_up_the_url_and_follows_url_changes(self):
+        known = {"https://remoteok.com/logo-a.png": 7}
+
+        def lookup(url):
+            sources = mock.Mock()
+            sources.values_list.return_value.first.return_value = known.get(url)
+            return sources
+
+        job = Job(id=1, remoteok_id=1, title="Dev", url="u", company_logo="https://remoteok.com/logo-a.png")
+        with mock.patch.object(logos.LogoSource.objects, "filter", side_effect=lookup), \
+                mock.patch.object(logos, "get_or_create_logo") as download, \
+                mock.patch.object(Job, "save") as save:
+            self.assertEqual(logos.attach_logo(job), 7)
+            self.assertEqual(job.logo_id, 7)
+            save.assert_called_once_with(update_fields=["logo"])
+
+            # Re-scraped with the same URL: one lookup, nothing saved.
+            save.reset_mock()
+            self.assertEqual(logos.attach_logo(job), 7)
+            save.assert_not_called()
+
+            # The listing now points at another logo URL.
+            job.company_logo = "https://remoteok.com/logo-b.png"
+            download.return_value = CompanyLogo(id=9)
+            with mock.patch.object(logos.LogoSource.objects, "get_or_create",
+                                   return_value=(logos.LogoSource(logo_id=9), True)):
+                self.assertEqual(logos.attach_logo(job), 9)
+            download.assert_called_once_with("https://remoteok.com/logo-b.png")
+            self.assertEqual(job.logo_id, 9)
+            save.assert_called_once_with(update_fields=["logo"])
+
+    def test_serializer_points_at_cached_thumbnail(self):
+        request = RequestFactory().get("/api/jobs/")
+        job = Job(id=1, remoteok_id=1, title="Dev", url="https://remoteok.com/remote-jobs/1", logo_id=7)
+
+        # No public origin: the request host (often 127.0.0.1) is not handed out.
+        data = JobSerializer(job, context={"request": request}).data
+        self.assertIsNone(data["company_logo_thumb"])
+        self.assertNotIn("logo", data)
+
+        with override_settings(LOGO_BASE_URL="https://jobs.example.com/"):
+            data = JobSerializer(job).data
+        self.assertEqual(data["company_logo_thumb"], "https://jobs.example.com/api/logos/7.jpg")
+
+        self.assertIsNone(JobSerializer(Job(id=2, remoteok_id=2, title="Dev", url="u")).data["company_logo_thumb"])
+
+
+class JobOrderingTests(SimpleTestCase):
+    def ordering(self, params):
+        view = JobViewSet(action="list", format_kwarg=None)
+        view.request = Request(RequestFactory().get("/api/jobs/", params))
+        return view.filter_queryset(Job.objects.order_by("-remoteok_id")).query.order_by
+
+    def test_ties_are_broken_by_remoteok_id_in_the_same_direction(self):
+        self.assertEqual(self.ordering({"ordering": "-posted_at"}), ("-posted_at", "-remoteok_id"))
+        self.assertEqual(self.ordering({"ordering": "scraped_at"}), ("scraped_at", "remoteok_id"))
+        self.assertEqual(self.ordering({"ordering": "remoteok_id"}), ("remoteok_id",))
+        self.assertEqual(self.ordering({}), ("-remoteok_id",))
+
+
+class FakeJobQuerySet:
+    """The slice of the QuerySet API JobViewSet uses for list and detail, over a list."""
+
+    model = Job
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def filter(self, **lookups):
+        return FakeJobQuerySet([
+            job for job in self.jobs if all(getattr(job, field) == value for field, value in lookups.items())
+        ])
+
+    def get(self, **lookups):
+        matches = self.filter(**lookups).jobs
+        if not matches:
+            raise Job.DoesNotExist
+        return matches[0]
+
+    async def aget(self, **lookups):
+        return self.get(**lookups)
+
+    def count(self):
+        return len(self.jobs)
+
+    async def acount(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FakeJobQuerySet(self.jobs[index])
+        return self.jobs[index]
+
+    def __iter__(self):
+        return iter(self.jobs)
+
+    async def __aiter__(self):
+        for job in self.jobs:
+            yield job
+
+    def __len__(self):
+        return len(self.jobs)
+
+
+class AsyncApiTests(SimpleTestCase):
+    def setUp(self):
+        jobs = [
+            Job(
+                id=n, remoteok_id=1093000 + n, title=f"Engineer {n} – “remote”\u2028", company="Acme",
+                url=f"https://remoteok.com/remote-jobs/{1093000 + n}", superseded=n % 3 == 0,
+                logo_id=n if n % 2 else None,
+            )
+            for n in range(25, 0, -1)
+        ]
+        patcher = mock.patch.object(JobViewSet, "get_queryset", return_value=FakeJobQuerySet(jobs))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertSameResponse(self, path, sync_view, async_view, **kwargs):
+        request = RequestFactory().get(path)
+        expected = sync_view(request, **kwargs)
+        expected.render()
+        actual = async_to_sync(async_view)(RequestFactory().get(path), **kwargs)
+        self.assertEqual(actual.status_code, expected.status_code, path)
+        self.assertEqual(actual["Content-Type"], expected["Content-Type"], path)
+        self.assertEqual(actual.content, expected.content, path)
+        return expected
+
+    def test_list_pages_match_the_viewset_byte_for_byte(self):
+        sync_list = JobViewSet.as_view({"get": "list"})
+        for query in ("", "?page=2", "?page=3", "?page=last", "?page=4", "?page=0", "?page=abc",
+                      "?collapse=true", "?collapse=true&page=2", "?collapse=true&page=3"):
+            self.assertSameResponse(f"/api/jobs/{query}", sync_list, async_views.job_list)
+        self.assertEqual(self.assertSameResponse("/api/jobs/?page=4", sync_list, async_views.job_list).status_code, 404)
+
+    def test_detail_matches_the_viewset_byte_for_byte(self):
+        sync_detail = JobViewSet.as_view({"get": "retrieve"})
+        for path, pk in (("/api/jobs/5/", 5), ("/api/jobs/99/", 99), ("/api/jobs/3/?collapse=true", 3)):
+            self.assertSameResponse(path, sync_detail, async_views.job_detail, pk=pk)
+        self.assertEqual(self.assertSameResponse("/api/jobs/99/", sync_detail, async_views.job_detail, pk=99).status_code, 404)
+
+
+class ProfilingTests(SimpleTestCase):
+    def test_profile_run_reports_stages_from_worker_threads(self):
+        def work():
+            for _ in range(2):
+                with profiling.stage("fetch"):
+                    sum(range(1000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with profiling.profile_run("scrape_jobs", output_dir=tmp) as session:
+                # Workers run in a copy of the run's context, as in scrape_jobs.
+                worker = threading.Thread(target=contextvars.copy_context().run, args=(work,))
+                worker.start()
+                worker.join()
+
+            summary = (session.output_dir / "summary.txt").read_text()
+            self.assertIn("stage fetch: 2 calls", summary)
+            self.assertTrue(list(session.output_dir.glob("run.*")))
+            if profiling.STAGE_PROFILES:
+                # The worker's own functions, which the run profile cannot see before 3.12.
+                self.assertIn("=== stage fetch ===", summary)
+                self.assertIn("builtins.sum", summary.split("=== run ===")[0])
+                self.assertTrue((session.output_dir / "stage-fetch.prof").exists())
+
+        # Outside a profiled run stages are free no-ops.
+        with profiling.stage("fetch"):
+            pass
+
+    def test_busy_profiler_does_not_break_the_run(self):
+        # Python 3.12+ raises this when another cProfile is already enabled.
+        busy = mock.Mock(side_effect=ValueError("Another profiling tool is already active"))
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict("sys.modules", {"pyinstrument": None}), \
+                mock.patch("cProfile.Profile.enable", busy):
+            with profiling.profile_run("scrape_jobs", output_dir=tmp) as session:
+                with profiling.stage("save"):
+                    pass
+
+            summary = (session.output_dir / "summary.txt").read_text()
+        self.assertIn("stage save: 1 calls", summary)
+        self.assertIn("not profiled", summary)
+
+
+class DbPoolStatsTests(SimpleTestCase):
+    def stats(self, requests_num, wait_ms):
+        return {"pool_size": 4, "pool_available": 1, "requests_num": requests_num, "requests_wait_ms": wait_ms}
+
+    def test_run_summary_reports_pool_activity_during_the_run(self):
+        logger = logging.getLogger("jobs.tests.pool")
+        with mock.patch.object(dbpool, "snapshot", side_effect=[self.stats(10, 50), self.stats(14, 90)]), \
+                self.assertLogs(logger, "INFO") as logs, log.run_summary("scrape_job_ids", logger):
+            log.count("processed")
+
+        pool_stats = logs.records[-1].db_pool
+        self.assertEqual(pool_stats["requests"], 4)
+        self.assertEqual(pool_stats["avg_wait_ms"], 10)
+        self.assertEqual(pool_stats["pool_size"], 4)
+
+    def test_api_middleware_logs_each_interval_since_the_previous_line(self):
+        from .middleware import PoolStatsLogMiddleware
+
+        with override_settings(DB_POOL=True, DB_POOL_LOG_INTERVAL=60):
+            middleware = PoolStatsLogMiddleware(lambda request: "response")
+        with mock.patch.object(dbpool, "snapshot", side_effect=[self.stats(5, 5), self.stats(7, 25)]), \
+                self.assertLogs("jobs.middleware", "INFO") as logs:
+            middleware.next_log = 0
+            self.assertEqual(middleware(None), "response")
+            # Within the interval nothing is read or logged.
+            middleware(None)
+            middleware.next_log = 0
+            middleware(None)
+        self.assertEqual([record.db_pool["requests"] for record in logs.records], [5, 2])
+
+        with override_settings(DB_POOL=False), self.assertRaises(MiddlewareNotUsed):
+            PoolStatsLogMiddleware(lambda request: None)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((threading.get_ident(), self.format(record), record))
+
+
+class QueueLoggingTests(SimpleTestCase):
+    def test_records_are_written_on_listener_thread_with_run_summary(self):
+        logger = logging.getLogger("jobs.tests.queue")
+        logging.config.dictConfig({
+            "version": 1,
+            "disable_existing_loggers": False,
+            "handlers": {
+                "list": {"()": ListHandler},
+                "queue": {"()": "jobs.log.QueueListenerHandler", "handlers": ["cfg://handlers.list"]},
+            },
+            "loggers": {"jobs.tests.queue": {"handlers": ["queue"], "level": "INFO", "propagate": False}},
+        })
+        self.addCleanup(logging.config.dictConfig, settings.LOGGING)
+        queue_handler = logger.handlers[0]
+        target = queue_handler.targets[0]
+
+        def job(job_id):
+            log.count("processed")
+            log.count("saved" if job_id % 2 else "not_found")
+            log.sampled_debug(logger, "Job %s", job_id, job_id=job_id)
+
+        with log.run_summary("scrape_jobs", logger):
+            workers = [
+                threading.Thread(target=contextvars.copy_context().run, args=(job, job_id))
+                for job_id in range(10)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        queue_handler.close()
+
+        # Only the summary is logged, formatted off the calling thread.
+        [(thread_id, message, record)] = target.records
+        self.assertNotEqual(thread_id, threading.get_ident())
+        self.assertIn("scrape_jobs: 10 jobs", message)
+        self.assertEqual(record.events, {"not_found": 5, "processed": 10, "saved": 5})
+        self.assertIn('"events": {"not_found": 5', log.JsonFormatter().format(record))
+
+    def test_concurrent_runs_keep_separate_summaries(self):
+        barrier = threading.Barrier(2)
+        summaries = {}
+
+        def run(name, jobs):
+            with log.run_summary(name, mock.Mock()) as summary:
+                barrier.wait()
+                for _ in range(jobs):
+                    log.count("processed")
+                barrier.wait()
+            summaries[name] = summary
+
+        runs = [threading.Thread(target=run, args=(f"run{jobs}", jobs)) for jobs in (3, 5)]
+        for thread in runs:
+            thread.start()
+        for thread in runs:
+            thread.join()
+
+        self.assertIsNot(summaries["run3"], summaries["run5"])
+        self.assertEqual(summaries["run3"].counts["processed"], 3)
+        self.assertEqual(summaries["run5"].counts["processed"], 5)
@@ -7,10 +7,6 @@ from django.utils import timezone
 from .models import Job
 from datetime import datetime
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
 logger = logging.getLogger(__name__)
 
 HEADERS = {
@@ -21,13 +17,18 @@ HEADERS = {
 BASE_URL = "https://remoteok.com"
 
 
+# Any whitespace run that contains a newline collapses to a single "\n";
+# remaining runs of spaces collapse to one space.
+NEWLINE_RUN_RE = re.compile(r"[^\S\n]*\n\s*")
+SPACE_RUN_RE = re.compile(r" {2,}")
+
+
 def clean_description(text: str) -> str:
     if not text:
         return ""
     text = text.replace("\xa0", " ").replace("\t", " ")
-    text = re.sub(r"\s*\n\s*", "\n", text)
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{2,}", "\n\n", text)
+    text = NEWLINE_RUN_RE.sub("\n", text)
+    text = SPACE_RUN_RE.sub(" ", text)
     return text.strip()
 
 
@@ -1,18 +1,23 @@
 import time
 import re
+import contextvars
 import json
+import signal
 import requests
 import logging
+import threading
 from bs4 import BeautifulSoup
+from django.db import close_old_connections
 from django.utils import timezone
+from .dedup import fingerprint, link_canonical
+from .log import count, run_summary, sampled_debug
+from .logos import attach_logo
 from .models import Job
+from .profiling import stage
+from contextlib import contextmanager
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
 logger = logging.getLogger(__name__)
 
 HEADERS = {
@@ -23,13 +28,18 @@ HEADERS = {
 BASE_URL = "https://remoteok.com"
 
 
+# Any whitespace run that contains a newline collapses to a single "\n";
+# remaining runs of spaces collapse to one space.
+NEWLINE_RUN_RE = re.compile(r"[^\S\n]*\n\s*")
+SPACE_RUN_RE = re.compile(r" {2,}")
+
+
 def clean_description(text: str) -> str:
     if not text:
         return ""
     text = text.replace("\xa0", " ").replace("\t", " ")
-    text = re.sub(r"\s*\n\s*", "\n", text)
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{2,}", "\n\n", text)
+    text = NEWLINE_RUN_RE.sub("\n", text)
+    text = SPACE_RUN_RE.sub(" ", text)
     return text.strip()
 
 
@@ -41,20 +51,24 @@ def fetch_page(url: str, retries=3, delay=10):
             return resp
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
-                logger.warning(f"⚠️ Page not found (404) for {url}. Skipping...")
+                # Most IDs in a range scan are gaps; count them instead of logging each.
+                count("not_found")
+                sampled_debug(logger, "Page not found (404) for %s", url, url=url)
                 return None
             if attempt < retries - 1:
-                logger.warning(f"⚠️ Error fetching {url}: {e}. Retrying in {delay}s...")
+                logger.warning("⚠️ Error fetching %s: %s. Retrying in %ss...", url, e, delay)
                 time.sleep(delay)
             else:
-                logger.error(f"❌ Failed to fetch {url}: {e}", exc_info=True)
+                count("fetch_failed")
+                logger.error("❌ Failed to fetch %s: %s", url, e, exc_info=True, extra={"url": url})
                 return None
         except requests.exceptions.RequestException as e:
             if attempt < retries - 1:
-                logger.warning(f"⚠️ Error fetching {url}: {e}. Retrying in {delay}s...")
+                logger.warning("⚠️ Error fetching %s: %s. Retrying in %ss...", url, e, delay)
                 time.sleep(delay)
             else:
-                logger.error(f"❌ Failed to fetch {url}: {e}", exc_info=True)
+                count("fetch_failed")
+                logger.error("❌ Failed to fetch %s: %s", url, e, exc_info=True, extra={"url": url})
                 return None
     return None
 
@@ -64,16 +78,19 @@ def parse_job_page(job_id: int, html: str):
 
     json_scripts = soup.find_all("script", {"type": "application/ld+json"})
     if not json_scripts:
-        logger.warning(f"⚠️ Job {job_id} skipped: No JSON-LD script found")
+        count("no_json_ld")
+        sampled_debug(logger, "Job %s skipped: No JSON-LD script found", job_id, job_id=job_id)
         return None
 
     try:
         json_data = json.loads(json_scripts[-1].string)
         if json_data.get("@type") != "JobPosting":
-            logger.warning(f"⚠️ Job {job_id} skipped: Last JSON-LD is not a JobPosting")
+            count("not_job_posting")
+            sampled_debug(logger, "Job %s skipped: Last JSON-LD is not a JobPosting", job_id, job_id=job_id)
             return None
     except json.JSONDecodeError as e:
-        logger.warning(f"⚠️ Job {job_id} skipped: Failed to parse JSON - {e}")
+        count("bad_json_ld")
+        logger.warning("⚠️ Job %s skipped: Failed to parse JSON - %s", job_id, e, extra={"job_id": job_id})
         return None
 
     title = json_data.get("title", "").strip()
@@ -95,18 +112,19 @@ def parse_job_page(job_id: int, html: str):
         href = apply_url_tag.get("href", "")
         apply_url = BASE_URL + href if href.startswith("/") else href
     else:
-        logger.warning(f"⚠️ Job {job_id}: No apply URL found")
+        count("no_apply_url")
+        sampled_debug(logger, "Job %s: No apply URL found", job_id, job_id=job_id)
 
     if not title or not company:
-        logger.warning(f"⚠️ Job {job_id} skipped: Missing title or company")
+        count("missing_title_or_company")
+        sampled_debug(logger, "Job %s skipped: Missing title or company", job_id, job_id=job_id)
         return None
 
     if company_logo and not company_logo.startswith("http"):
         company_logo = BASE_URL + company_logo
-    if company_logo:
-        logger.info(f"✅ Job {job_id}: Company logo extracted from JSON")
-    else:
-        logger.warning(f"⚠️ Job {job_id}: No valid company logo found")
+    if not company_logo:
+        count("no_logo")
+        sampled_debug(logger, "Job %s: No valid company logo found", job_id, job_id=job_id)
 
     return {
         "remoteok_id": job_id,
@@ -122,14 +140,24 @@ def parse_job_page(job_id: int, html: str):
 
 
 def save_job(job_data: dict):
+    job_id = job_data["remoteok_id"]
     try:
-        Job.objects.update_or_create(
-            remoteok_id=job_data["remoteok_id"],
-            defaults=job_data,
+        job, _ = Job.objects.update_or_create(
+            remoteok_id=job_id,
+            defaults={**job_data, **fingerprint(job_data)},
         )
-        logger.info(f"✅ Saved job {job_data['remoteok_id']}: {job_data['title'][:50]}")
+        canonical = link_canonical(job)
+        if canonical:
+            count("reposts")
+            sampled_debug(logger, "♻️ Job %s is a repost of %s", job_id, canonical.remoteok_id, job_id=job_id)
+        attach_logo(job)
     except Exception as e:
-        logger.error(f"❌ Failed to save job {job_data['remoteok_id']}: {e}")
+        count("save_failed")
+        logger.error("❌ Failed to save job %s: %s", job_id, e, extra={"job_id": job_id})
+        return False
+    count("saved")
+    sampled_debug(logger, "✅ Saved job %s: %.50s", job_id, job_data["title"], job_id=job_id)
+    return True
 
 
 def get_latest_remoteok_id():
@@ -146,20 +174,69 @@ def get_latest_remoteok_id():
 
 
 def scrape_job_wrapper(job_id):
-    logger.info(f"🔎 Processing job {job_id}...")
-    resp = fetch_page(f"{BASE_URL}/remote-jobs/{job_id}")
+    # Per-job outcomes are counted for the run summary (see jobs.log); only
+    # a sample of jobs gets DEBUG lines.
+    sampled_debug(logger, "🔎 Processing job %s...", job_id, job_id=job_id)
+    with stage("fetch"):
+        resp = fetch_page(f"{BASE_URL}/remote-jobs/{job_id}")
     if not resp:
-        logger.warning(f"⚠️ Job {job_id} skipped: Failed to fetch page")
         return None
-    job_data = parse_job_page(job_id, resp.text)
+    with stage("parse"):
+        job_data = parse_job_page(job_id, resp.text)
     if not job_data:
-        logger.warning(f"⚠️ Job {job_id} skipped: No valid data parsed")
         return None
-    save_job(job_data)
-    return job_data
+    try:
+        with stage("save"):
+            saved = save_job(job_data)
+    finally:
+        # Worker threads have no request cycle to release their connection;
+        # hand it back to the pool (or drop it once CONN_MAX_AGE expires).
+        close_old_connections()
+    # Only report success so the job dict is freed as soon as it is saved.
+    return saved
+
+
+@contextmanager
+def stop_on_sigterm(stop_event):
+    """Set ``stop_event`` on SIGTERM; signal handlers only work in the main thread."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handler(signum, frame):
+        logger.warning("🛑 SIGTERM received, finishing in-flight jobs...")
+        stop_event.set()
+
+    previous = signal.signal(signal.SIGTERM, handler)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous)
 
 
-def scrape_jobs(start_id=None, end_id=None, max_workers=5):
+def missing_job_ids(start_id, end_id, chunk_size=1000):
+    """IDs in ``start_id..end_id`` not stored yet, one indexed lookup per chunk."""
+    for chunk_start in range(start_id, end_id + 1, chunk_size):
+        chunk_end = min(chunk_start + chunk_size - 1, end_id)
+        stored = set(
+            Job.objects.filter(remoteok_id__range=(chunk_start, chunk_end)).values_list("remoteok_id", flat=True)
+        )
+        for job_id in range(chunk_start, chunk_end + 1):
+            if job_id not in stored:
+                yield job_id
+
+
+def scrape_jobs(start_id=None, end_id=None, max_workers=5, window=None, stop_event=None, skip_existing=False):
+    """
+    Scrape ``start_id..end_id`` with at most ``window`` IDs in flight.
+
+    New IDs are submitted only as earlier ones finish, so memory stays flat
+    regardless of range size. Setting ``stop_event`` (or SIGTERM in the main
+    thread) stops submitting; in-flight jobs finish and ``next_id`` tells
+    where to resume. ``skip_existing`` leaves out IDs already in the database.
+    """
+    window = window or max_workers * 4
+    stop_event = stop_event or threading.Event()
     try:
         if start_id is None or end_id is None:
             logger.info("🔍 start/end berilmagan, RemoteOK dan oxirgi job id olinmoqda...")
@@ -176,21 +253,55 @@ def scrape_jobs(start_id=None, end_id=None, max_workers=5):
                 logger.info("✅ No new jobs")
                 return {"status": "no new jobs"}
 
-        logger.info(f"🚀 Scraping jobs from {start_id} to {end_id}...")
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_job = {executor.submit(scrape_job_wrapper, job_id): job_id for job_id in range(start_id, end_id + 1)}
-            for future in as_completed(future_to_job):
-                job_id = future_to_job[future]
-                try:
-                    result = future.result()
-                    if result:
-                        logger.info(f"✅ Job {job_id} processed successfully")
-                except Exception as e:
-                    logger.error(f"❌ Job {job_id} failed: {e}")
-
-        return {"status": "done"}
+        logger.info("🚀 Scraping jobs from %s to %s...", start_id, end_id)
+
+        job_ids = missing_job_ids(start_id, end_id) if skip_existing else iter(range(start_id, end_id + 1))
+        in_flight = {}
+        processed = saved = 0
+        next_id = start_id
+
+        with (
+            run_summary("scrape_jobs", logger),
+            stop_on_sigterm(stop_event),
+            ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ):
+
+            def submit_next():
+                nonlocal next_id
+                if stop_event.is_set():
+                    return
+                job_id = next(job_ids, None)
+                if job_id is not None:
+                    # Each job runs in a copy of this context so count() and
+                    # stage() report to this run's summary and profile.
+                    context = contextvars.copy_context()
+                    in_flight[executor.submit(context.run, scrape_job_wrapper, job_id)] = job_id
+                    next_id = job_id + 1
+
+            for _ in range(window):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = in_flight.pop(future)
+                    processed += 1
+                    count("processed")
+                    try:
+                        if future.result():
+                            saved += 1
+                    except Exception as e:
+                        count("failed")
+                        logger.error("❌ Job %s failed: %s", job_id, e, extra={"job_id": job_id})
+                    submit_next()
+
+        cancelled = stop_event.is_set() and next_id <= end_id
+        result = {"status": "cancelled" if cancelled else "done", "processed": processed, "saved": saved}
+        if cancelled:
+            logger.warning("🛑 Scrape cancelled, resume from job %s", next_id)
+            result["next_id"] = next_id
+        return result
 
     except Exception as e:
-        logger.exception(f"❌ scrape_jobs failed: {e}")
-        return {"error": str(e)}
\ No newline at end of file
+        logger.exception("❌ scrape_jobs failed: %s", e)
+        return {"error": str(e)}
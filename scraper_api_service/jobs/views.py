@@ -1,11 +1,31 @@
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, filters
-from .models import Job
+from .filters import CollapseRepostsFilter, StableOrderingFilter
+from .models import CompanyLogo, Job
 from .serializers import JobSerializer
 
+# Thumbnails never change once written, so clients may cache them for a year.
+LOGO_CACHE_SECONDS = 365 * 24 * 60 * 60
+
 
 class JobViewSet(viewsets.ModelViewSet):
     queryset = Job.objects.all().order_by("-remoteok_id")
     serializer_class = JobSerializer
 
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [filters.SearchFilter, StableOrderingFilter, CollapseRepostsFilter]
     search_fields = ['title', 'company']
+    ordering_fields = ['remoteok_id', 'posted_at', 'scraped_at']
+
+
+@require_GET
+@cache_control(public=True, max_age=LOGO_CACHE_SECONDS, immutable=True)
+def logo_thumbnail(request, pk):
+    logo = get_object_or_404(CompanyLogo, pk=pk)
+    try:
+        thumbnail = logo.thumbnail.open("rb")
+    except FileNotFoundError:
+        raise Http404("Logo thumbnail is missing")
+    return FileResponse(thumbnail, content_type="image/jpeg")
@@ -0,0 +1,191 @@
+"""
+Cheap polling of the RemoteOK listing page for newly posted jobs.
+
+Each check is one conditional GET (If-None-Match / If-Modified-Since), so an
+unchanged page costs a 304 with no body. The newest seen remoteok_id (the
+high-water mark) and the validators live in Redis, so a check never touches
+Postgres once the mark is seeded. Only IDs actually listed above the mark are
+returned, instead of every ID in the numeric range.
+
+New IDs are also recorded in a pending hash before the mark moves past them.
+An ID leaves it once it is saved, or after MAX_ATTEMPTS failed scrapes, so a
+failed or lost batch is retried on the next tick. A batch claims its IDs
+with a lease first: while one is scraping an ID, later ticks skip it, and a
+batch lost with its worker is retried once the lease runs out. The daily backstop scans
+the ID range between its own checkpoint and the mark, catching IDs that were
+never listed on the first page or that kept failing.
+"""
+import logging
+import time
+
+import redis
+import requests
+from bs4 import BeautifulSoup
+from django.conf import settings
+
+from .models import Job
+from .utils2 import BASE_URL, HEADERS
+
+logger = logging.getLogger(__name__)
+
+LISTING_URL = BASE_URL + "?order_by=date"
+HIGH_WATER_MARK_KEY = "remoteok:high_water_mark"
+ETAG_KEY = "remoteok:listing_etag"
+LAST_MODIFIED_KEY = "remoteok:listing_last_modified"
+# Hash of job ID -> failed attempts for IDs enqueued but not saved yet.
+PENDING_KEY = "remoteok:pending_ids"
+# Hash of job ID -> unix time its lease runs out, for IDs a batch has claimed.
+LEASES_KEY = "remoteok:pending_leases"
+# Worst case for one ID: three 30 s fetch attempts, two 10 s retry delays and
+# a logo download. The n-th ID of a batch is leased for n times this.
+LEASE_SECONDS_PER_JOB = 150
+BACKSTOP_CHECKPOINT_KEY = "remoteok:backstop_checkpoint"
+MAX_ATTEMPTS = 3
+
+# Raise a mark (or checkpoint) only if the new value is higher, atomically,
+# so overlapping runs can never move it backwards.
+ADVANCE_MARK_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local new = tonumber(ARGV[1])
+if new > current then
+    redis.call('SET', KEYS[1], ARGV[1])
+    return new
+end
+return current
+"""
+
+# Claim the pending IDs in ARGV[3:] whose lease is missing or expired;
+# ARGV[1] is now, ARGV[2] the lease per position in the batch.
+CLAIM_SCRIPT = """
+local now = tonumber(ARGV[1])
+local per_job = tonumber(ARGV[2])
+local claimed = {}
+for i = 3, #ARGV do
+    local job_id = ARGV[i]
+    if redis.call('HEXISTS', KEYS[1], job_id) == 1
+            and tonumber(redis.call('HGET', KEYS[2], job_id) or '0') <= now then
+        table.insert(claimed, job_id)
+        redis.call('HSET', KEYS[2], job_id, now + per_job * #claimed)
+    end
+end
+return claimed
+"""
+
+_redis_client = None
+
+
+def get_redis():
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+def get_high_water_mark(client):
+    mark = client.get(HIGH_WATER_MARK_KEY)
+    if mark is not None:
+        return int(mark)
+    # First run only: seed from the newest stored job.
+    last_job = Job.objects.order_by("-remoteok_id").first()
+    mark = last_job.remoteok_id if last_job else 0
+    client.set(HIGH_WATER_MARK_KEY, mark, nx=True)
+    return int(client.get(HIGH_WATER_MARK_KEY))
+
+
+def parse_listing_ids(html: str):
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        int(row["data-id"])
+        for row in soup.find_all("tr", {"class": "job"})
+        if row.get("data-id", "").isdigit()
+    ]
+
+
+def check_for_new_jobs():
+    """Return listed job IDs above the high-water mark (oldest first) and advance the mark."""
+    client = get_redis()
+
+    headers = dict(HEADERS)
+    etag = client.get(ETAG_KEY)
+    last_modified = client.get(LAST_MODIFIED_KEY)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    try:
+        resp = requests.get(LISTING_URL, headers=headers, timeout=15)
+    except requests.exceptions.RequestException as e:
+        logger.warning("⚠️ Listing check failed: %s", e)
+        return []
+    if resp.status_code == 304:
+        return []
+    if resp.status_code != 200:
+        logger.warning("⚠️ Listing check returned HTTP %s", resp.status_code)
+        return []
+
+    if resp.headers.get("ETag"):
+        client.set(ETAG_KEY, resp.headers["ETag"])
+    if resp.headers.get("Last-Modified"):
+        client.set(LAST_MODIFIED_KEY, resp.headers["Last-Modified"])
+
+    mark = get_high_water_mark(client)
+    new_ids = sorted({job_id for job_id in parse_listing_ids(resp.text) if job_id > mark})
+    if new_ids:
+        # Pending first: an ID must never be above the mark without being
+        # recorded somewhere it will be retried from.
+        for job_id in new_ids:
+            client.hsetnx(PENDING_KEY, job_id, 0)
+        client.eval(ADVANCE_MARK_SCRIPT, 1, HIGH_WATER_MARK_KEY, new_ids[-1])
+        logger.info("🆕 %d new job(s) listed after %s: %s", len(new_ids), mark, new_ids)
+    return new_ids
+
+
+def pending_job_ids():
+    """IDs found by the watcher that are neither saved nor leased by a running batch, oldest first."""
+    client = get_redis()
+    now = time.time()
+    leases = client.hgetall(LEASES_KEY)
+    return sorted(
+        int(job_id) for job_id in client.hkeys(PENDING_KEY)
+        if float(leases.get(job_id, 0)) <= now
+    )
+
+
+def claim_job_ids(job_ids):
+    """Lease the still-pending, unleased IDs of ``job_ids`` to the caller and return them."""
+    if not job_ids:
+        return []
+    claimed = get_redis().eval(
+        CLAIM_SCRIPT, 2, PENDING_KEY, LEASES_KEY, time.time(), LEASE_SECONDS_PER_JOB, *job_ids
+    )
+    return [int(job_id) for job_id in claimed]
+
+
+def mark_job_done(job_id):
+    client = get_redis()
+    client.hdel(PENDING_KEY, job_id)
+    client.hdel(LEASES_KEY, job_id)
+
+
+def mark_job_failed(job_id):
+    """Count a failed attempt and release the lease; after MAX_ATTEMPTS the ID is left to the backstop."""
+    client = get_redis()
+    attempts = client.hincrby(PENDING_KEY, job_id, 1)
+    client.hdel(LEASES_KEY, job_id)
+    if attempts >= MAX_ATTEMPTS:
+        client.hdel(PENDING_KEY, job_id)
+        logger.warning("⚠️ Job %s failed %s times, leaving it to the daily backstop", job_id, attempts)
+
+
+def backstop_range():
+    """``(start_id, end_id)`` between the backstop checkpoint and the high-water mark."""
+    client = get_redis()
+    mark = get_high_water_mark(client)
+    # First run: start at the current mark, later runs cover what came after.
+    client.set(BACKSTOP_CHECKPOINT_KEY, mark, nx=True)
+    return int(client.get(BACKSTOP_CHECKPOINT_KEY)) + 1, mark
+
+
+def advance_backstop_checkpoint(job_id):
+    get_redis().eval(ADVANCE_MARK_SCRIPT, 1, BACKSTOP_CHECKPOINT_KEY, job_id)
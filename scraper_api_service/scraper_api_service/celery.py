@@ -3,6 +3,9 @@ import os
 from celery import Celery
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "scraper_api_service.settings")
+# Django system checks load the URLconf (DRF views, drf_yasg, admin) which
+# workers never serve; `manage.py check` and runserver still run them.
+os.environ.setdefault("CELERY_SKIP_CHECKS", "true")
 
 app = Celery("scraper_api_service")
 
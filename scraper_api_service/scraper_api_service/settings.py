@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'jobs',
     'rest_framework',
     'drf_yasg',
@@ -51,8 +52,20 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Disabled unless PROFILE_REQUESTS_SAMPLE_RATE > 0
+    'jobs.middleware.SampledProfilingMiddleware',
+    # Disabled when DB_POOL_LOG_INTERVAL is 0 or DB_POOL is off
+    'jobs.middleware.PoolStatsLogMiddleware',
 ]
 
+# Profiles from `scrape_jobs --profile`, scrape_latest_jobs(profile=True)
+# and sampled API requests.
+PROFILE_DIR = os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+# Fraction of JobViewSet requests to profile, e.g. 0.01; at most one
+# profile per PROFILE_REQUESTS_MIN_INTERVAL seconds per process.
+PROFILE_REQUESTS_SAMPLE_RATE = float(os.getenv('PROFILE_REQUESTS_SAMPLE_RATE', '0'))
+PROFILE_REQUESTS_MIN_INTERVAL = float(os.getenv('PROFILE_REQUESTS_MIN_INTERVAL', '10'))
+
 ROOT_URLCONF = 'scraper_api_service.urls'
 
 TEMPLATES = [
@@ -76,6 +89,16 @@ WSGI_APPLICATION = 'scraper_api_service.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# psycopg3 connection pool, shared by every thread of a process (API
+# workers, Celery scrape threads). CONN_HEALTH_CHECKS makes the pool check
+# each connection before handing it out. Set DB_POOL=False to fall back to
+# persistent per-thread connections, e.g. behind an external pooler.
+DB_POOL = os.getenv('DB_POOL', 'True') == 'True'
+
+# API processes log their pool's size, wait times and request counts at
+# most this often (seconds, 0 disables); scrape runs log theirs per run.
+DB_POOL_LOG_INTERVAL = float(os.getenv('DB_POOL_LOG_INTERVAL', '300'))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -84,6 +107,15 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': 'localhost',
         'PORT': '5432',
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+            },
+        } if DB_POOL else {},
     }
 }
 
@@ -95,19 +127,54 @@ REST_FRAMEWORK = {
 
 
 # Celery konfiguratsiya
-CELERY_BROKER_URL = "redis://localhost:6379/0"
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CELERY_BROKER_URL = REDIS_URL
+# Keep the queue-based LOGGING below instead of Celery's own root handlers.
+CELERY_WORKER_HIJACK_ROOT_LOGGER = False
 
 from celery.schedules import crontab
 
 CELERY_BEAT_SCHEDULE = {
-    "scrape-latest-jobs-every-6-hours": {
+    # Conditional GET of the listing page; enqueues only newly listed IDs.
+    "watch-new-jobs-every-minute": {
+        "task": "jobs.tasks.watch_new_jobs",
+        "schedule": 60.0,
+        "options": {"expires": 55},
+    },
+    # Backstop for IDs the watcher missed (downtime, jobs that fell off the
+    # first listing page, repeated failures): scans the IDs between its own
+    # checkpoint and the watcher's mark, skipping jobs already stored.
+    "scrape-latest-jobs-daily": {
         "task": "jobs.tasks.scrape_latest_jobs",
-        "schedule": crontab(minute=0, hour="*/6"),
+        "schedule": crontab(minute=0, hour=3),
     },
 
 }
 
 
+# The root handler queues records for a background thread (jobs.log), so
+# scraper worker threads never block on the console lock or stream I/O.
+# LOG_FORMAT=json writes one JSON object per line, including `extra` fields.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {'format': '%(asctime)s [%(levelname)s] %(message)s'},
+        'json': {'()': 'jobs.log.JsonFormatter'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': os.getenv('LOG_FORMAT', 'simple')},
+        # Configured after 'console' (handlers are set up in name order).
+        'queue': {'()': 'jobs.log.QueueListenerHandler', 'handlers': ['cfg://handlers.console']},
+    },
+    'root': {'handlers': ['queue'], 'level': os.getenv('LOG_LEVEL', 'INFO')},
+}
+
+# Share of per-job DEBUG lines the scraper emits when LOG_LEVEL=DEBUG; per-run
+# summaries are always logged at INFO.
+SCRAPER_LOG_SAMPLE_RATE = float(os.getenv('SCRAPER_LOG_SAMPLE_RATE', '0.01'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -144,6 +211,13 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Cached company logo thumbnails (jobs.logos)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+# Public origin for thumbnail URLs handed to Telegram, e.g. https://jobs.example.com.
+# Unset, the API returns no company_logo_thumb and the bot uses company_logo.
+LOGO_BASE_URL = os.getenv('LOGO_BASE_URL', '')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -19,6 +19,7 @@ from django.urls import path, include
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from jobs.views import logo_thumbnail
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -36,6 +37,8 @@ schema_view = get_schema_view(
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/jobs/', include('jobs.urls')),
+    path('api/async/jobs/', include('jobs.async_urls')),
+    path('api/logos/<int:pk>.jpg', logo_thumbnail, name='logo-thumbnail'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
@@ -12,10 +12,10 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.filters import Command
 from aiogram.exceptions import TelegramBadRequest
-from bs4 import BeautifulSoup
 
-from telegram_bot_service.config import TELEGRAM_TOKEN
+from telegram_bot_service.config import NAV_CACHE_MAX_CHATS, NAV_CACHE_PAGES, NAV_CACHE_TTL, TELEGRAM_TOKEN
 from telegram_bot_service.services.api_client import search_jobs, get_job_detail
+from telegram_bot_service.services.page_cache import LatestPagesCache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +32,10 @@ dp = Dispatcher()
 
 PAGE_SIZE = 10
 
+# Pages are prefetched while the user reads the current one, so Next and
+# job buttons are answered without waiting on the API.
+latest_pages = LatestPagesCache(max_chats=NAV_CACHE_MAX_CHATS, max_pages=NAV_CACHE_PAGES, ttl=NAV_CACHE_TTL)
+
 def format_job_message(job: Dict) -> str:
     posted_at_str = job.get("posted_at", "")
     if posted_at_str:
@@ -44,7 +48,9 @@ def format_job_message(job: Dict) -> str:
     else:
         posted_at = "Unknown"
 
-    # Clean description
+    # Clean description; bs4 is imported on first use to keep bot startup fast
+    from bs4 import BeautifulSoup
+
     description = job.get("description", "No description")
     description = BeautifulSoup(description, "html.parser").get_text()
     description = description.replace("\\n", "\n").strip()
@@ -80,7 +86,7 @@ async def inline_handler(inline_query: InlineQuery):
                 id=f"{job['id']}_{offset}_{query}_{index}",
                 title=f"{job['title']} at {job['company']}",
                 description=job.get("short_description", ""),
-                thumb_url=job.get("company_logo", ""),
+                thumbnail_url=job.get("company_logo_thumb") or job.get("company_logo") or None,
                 input_message_content=InputTextMessageContent(
                     message_text=format_job_message(job)
                 )
@@ -101,7 +107,12 @@ async def cmd_start(message: Message):
 
 
 async def show_latest(message_or_callback, page: int = 1, edit=True):
-    data = await search_jobs(query="", page=page)
+    if isinstance(message_or_callback, CallbackQuery):
+        chat_id = message_or_callback.message.chat.id
+    else:
+        chat_id = message_or_callback.chat.id
+    # A new /latest starts from a fresh listing; Next/Previous reuse it.
+    data = await latest_pages.get_page(chat_id, page, refresh=not edit)
     jobs_list = data.get("results", [])
 
     if not jobs_list:
@@ -148,10 +159,12 @@ async def cmd_latest(message: Message):
 @dp.callback_query()
 async def callback_handler(callback_query: CallbackQuery):
     data = callback_query.data
+    # Stop the button's loading spinner right away instead of after the reply.
+    await callback_query.answer()
 
     if data.startswith("job_"):
         job_id = int(data.split("_")[1])
-        job = await get_job_detail(job_id)
+        job = latest_pages.get_job(callback_query.message.chat.id, job_id) or await get_job_detail(job_id)
         if not job:
             await callback_query.message.answer("❌ Job not found!")
             return
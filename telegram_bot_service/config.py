@@ -5,3 +5,8 @@ load_dotenv()
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8000/api")
+
+# /latest navigation cache (see services/page_cache.py)
+NAV_CACHE_MAX_CHATS = int(os.getenv("NAV_CACHE_MAX_CHATS", "1000"))
+NAV_CACHE_PAGES = int(os.getenv("NAV_CACHE_PAGES", "5"))
+NAV_CACHE_TTL = int(os.getenv("NAV_CACHE_TTL", "300"))
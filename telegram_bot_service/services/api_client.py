@@ -3,11 +3,11 @@ from telegram_bot_service.config import API_URL
 
 
 async def search_jobs(query: str, page: int = 1):
-    """Search jobs with pagination"""
+    """Search jobs with pagination, hiding reposts of the same role"""
     async with httpx.AsyncClient() as client:
         resp = await client.get(
             f"{API_URL}/jobs/",
-            params={"search": query, "page": page}
+            params={"search": query, "page": page, "collapse": "true"}
         )
         resp.raise_for_status()
         return resp.json()
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from telegram_bot_service.services.api_client import search_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class LatestPagesCache:
+    """
+    Per-chat cache of /latest pages, with the next page prefetched.
+
+    Each chat keeps its ``max_pages`` most recently viewed pages for ``ttl``
+    seconds; the least recently active chats are dropped beyond
+    ``max_chats``. Pages are per chat so Next/Previous walks the listing the
+    user started from even if new jobs arrive meanwhile. Job buttons are
+    answered from the jobs on the cached pages: the list endpoint returns
+    the same payload as the detail endpoint.
+    """
+
+    def __init__(self, max_chats: int = 1000, max_pages: int = 5, ttl: float = 300):
+        self.max_chats = max_chats
+        self.max_pages = max_pages
+        self.ttl = ttl
+        # chat_id -> OrderedDict(page -> (fetched_at, data)), least recent first
+        self.chats = OrderedDict()
+        # (chat_id, page) -> asyncio.Task fetching that page
+        self.pending = {}
+
+    def _pages(self, chat_id):
+        pages = self.chats.get(chat_id)
+        if pages is None:
+            pages = self.chats[chat_id] = OrderedDict()
+            while len(self.chats) > self.max_chats:
+                evicted, _ = self.chats.popitem(last=False)
+                for key in [key for key in self.pending if key[0] == evicted]:
+                    self.pending.pop(key).cancel()
+        self.chats.move_to_end(chat_id)
+        return pages
+
+    def _fresh(self, pages, page):
+        """The page's data unless it is missing or expired; leaves recency alone."""
+        entry = pages.get(page)
+        if not entry:
+            return None
+        fetched_at, data = entry
+        if time.monotonic() - fetched_at > self.ttl:
+            del pages[page]
+            return None
+        return data
+
+    def _cached(self, chat_id, page):
+        pages = self.chats.get(chat_id)
+        data = self._fresh(pages, page) if pages else None
+        if data is None:
+            return None
+        pages.move_to_end(page)
+        self.chats.move_to_end(chat_id)
+        return data
+
+    def _store(self, chat_id, page, data):
+        pages = self._pages(chat_id)
+        pages[page] = (time.monotonic(), data)
+        pages.move_to_end(page)
+        while len(pages) > self.max_pages:
+            pages.popitem(last=False)
+
+    async def _fetch(self, chat_id, page):
+        data = await search_jobs(query="", page=page)
+        self._store(chat_id, page, data)
+        return data
+
+    async def get_page(self, chat_id, page: int, refresh: bool = False):
+        """
+        Return the page from cache, an in-flight prefetch or the API, then
+        prefetch the next one. ``refresh`` drops the chat's cached pages first.
+        """
+        if refresh:
+            self.chats.pop(chat_id, None)
+        data = self._cached(chat_id, page)
+        if data is None:
+            task = self.pending.get((chat_id, page))
+            if task is not None:
+                # Unlike awaiting the task, wait() neither raises its error nor
+                # cancels it if this handler is cancelled.
+                await asyncio.wait({task})
+                if not task.cancelled() and task.exception() is None:
+                    data = task.result()
+            if data is None:
+                data = await self._fetch(chat_id, page)
+
+        if data.get("next"):
+            self.prefetch(chat_id, page + 1)
+        return data
+
+    def prefetch(self, chat_id, page: int):
+        """Fetch ``page`` in the background unless it is cached or already being fetched."""
+        key = (chat_id, page)
+        if key in self.pending or self._cached(chat_id, page) is not None:
+            return
+        task = asyncio.create_task(self._fetch(chat_id, page))
+        self.pending[key] = task
+        task.add_done_callback(lambda done: self._prefetch_done(key, done))
+
+    def _prefetch_done(self, key, task):
+        if self.pending.get(key) is task:
+            del self.pending[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("⚠️ Prefetch of page %s for chat %s failed: %s", key[1], key[0], task.exception())
+
+    def get_job(self, chat_id, job_id: int):
+        """The job payload from one of the chat's cached pages, if any."""
+        # A job lookup is not a page view: page and chat recency stay as they are.
+        pages = self.chats.get(chat_id, {})
+        for page in reversed(list(pages)):
+            data = self._fresh(pages, page)
+            for job in (data or {}).get("results", []):
+                if job.get("id") == job_id:
+                    return job
+        return None
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from telegram_bot_service.services import page_cache
+from telegram_bot_service.services.page_cache import LatestPagesCache
+
+LAST_PAGE = 3
+
+
+def listing(page):
+    return {
+        "next": f"?page={page + 1}" if page < LAST_PAGE else None,
+        "results": [{"id": page * 10 + i, "title": f"Job {page}.{i}"} for i in range(2)],
+    }
+
+
+class LatestPagesCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = []
+        self.fail_pages = set()
+        patcher = mock.patch.object(page_cache, "search_jobs", side_effect=self.search_jobs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def search_jobs(self, query="", page=1):
+        self.calls.append(page)
+        await asyncio.sleep(0)
+        if page in self.fail_pages:
+            raise RuntimeError(f"page {page} failed")
+        return listing(page)
+
+    async def settle(self, cache):
+        while cache.pending:
+            await asyncio.wait(set(cache.pending.values()))
+
+    async def test_next_page_is_served_from_the_prefetch(self):
+        cache = LatestPagesCache()
+        self.assertEqual(await cache.get_page(1, 1), listing(1))
+        await self.settle(cache)
+        self.assertEqual(self.calls, [1, 2])
+
+        self.assertEqual(await cache.get_page(1, 2), listing(2))
+        self.assertEqual(await cache.get_page(1, 1), listing(1))
+        await self.settle(cache)
+        # Page 2 came from the prefetch; page 3 is prefetched but never beyond the last page.
+        self.assertEqual(self.calls, [1, 2, 3])
+
+    async def test_in_flight_prefetch_is_awaited_not_repeated(self):
+        cache = LatestPagesCache()
+        await cache.get_page(1, 1)
+        self.assertIn((1, 2), cache.pending)
+
+        self.assertEqual(await cache.get_page(1, 2), listing(2))
+        self.assertEqual(self.calls.count(2), 1)
+
+    async def test_failed_prefetch_falls_back_to_a_direct_fetch(self):
+        cache = LatestPagesCache()
+        self.fail_pages.add(2)
+        with self.assertLogs(page_cache.logger, "WARNING"):
+            await cache.get_page(1, 1)
+            await self.settle(cache)
+
+        self.fail_pages.clear()
+        self.assertEqual(await cache.get_page(1, 2), listing(2))
+        self.assertEqual(self.calls.count(2), 2)
+
+    async def test_refresh_refetches_the_page(self):
+        cache = LatestPagesCache()
+        await cache.get_page(1, 1)
+        await cache.get_page(1, 1, refresh=True)
+        self.assertEqual(self.calls.count(1), 2)
+
+    async def test_least_recent_chats_and_pages_are_evicted(self):
+        cache = LatestPagesCache(max_chats=2, max_pages=2)
+        await cache.get_page("a", 3)
+        await cache.get_page("b", 3)
+        await cache.get_page("a", 3)
+        await cache.get_page("c", 3)
+        self.assertEqual(list(cache.chats), ["a", "c"])
+
+        await cache.get_page("a", 2)
+        await cache.get_page("a", 1)
+        await self.settle(cache)
+        # Page 1 and its prefetched page 2 pushed out page 3, the least recent.
+        self.assertEqual(list(cache.chats["a"]), [1, 2])
+
+    async def test_evicting_a_chat_cancels_its_prefetches(self):
+        cache = LatestPagesCache(max_chats=1)
+        await cache.get_page("a", 1)
+        prefetch = cache.pending[("a", 2)]
+
+        await cache.get_page("b", 3)
+        await asyncio.wait({prefetch})
+        self.assertTrue(prefetch.cancelled())
+        self.assertNotIn("a", cache.chats)
+
+    async def test_expired_pages_are_refetched(self):
+        cache = LatestPagesCache(ttl=60)
+        with mock.patch.object(page_cache.time, "monotonic", return_value=1000):
+            await cache.get_page(1, 3)
+        with mock.patch.object(page_cache.time, "monotonic", return_value=1061):
+            self.assertIsNone(cache.get_job(1, 30))
+            await cache.get_page(1, 3)
+        self.assertEqual(self.calls, [3, 3])
+
+    async def test_get_job_finds_cached_jobs_without_reordering(self):
+        cache = LatestPagesCache()
+        await cache.get_page("a", 1)
+        await cache.get_page("b", 3)
+        await self.settle(cache)
+        chats, pages = list(cache.chats), list(cache.chats["a"])
+
+        self.assertEqual(cache.get_job("a", 11), listing(1)["results"][1])
+        self.assertEqual(cache.get_job("a", 21), listing(2)["results"][1])
+        self.assertIsNone(cache.get_job("a", 31))
+        self.assertIsNone(cache.get_job("unknown", 11))
+        self.assertEqual(list(cache.chats), chats)
+        self.assertEqual(list(cache.chats["a"]), pages)
+
+
+if __name__ == "__main__":
+    unittest.main()